@@ -0,0 +1,244 @@
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from ..wordle_solver.runners import Runner
+from ..wordle_solver.solvers import GreedyEntropySolver, LookaheadSolver, Solver
+from ..wordle_solver.wordle import Wordle
+
+SOLVERS = {'greedy': GreedyEntropySolver, 'lookahead': LookaheadSolver}
+BENCHMARKS = ['get_entropy', 'get_possibilities', 'get_best_guess', 'play', 'play_all']
+
+
+def default_pool_sizes(corpus_len):
+    # 2, 16, 128, ... up to the full corpus
+    sizes = [2]
+    while sizes[-1] * 8 < corpus_len:
+        sizes += [sizes[-1] * 8]
+    return sizes + [corpus_len]
+
+
+def measure(fn, args_list, min_calls, min_time):
+    # calls fn on args_list round robin until both min_calls and min_time are reached, returns latencies in s
+    latencies = []
+    start = time.perf_counter()
+    while len(latencies) < min_calls or time.perf_counter() - start < min_time:
+        args = args_list[len(latencies) % len(args_list)]
+        t = time.perf_counter()
+        fn(*args)
+        latencies += [time.perf_counter() - t]
+    return latencies
+
+
+def peak_memory(fn, args):
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def summarize(name, pool_size, latencies, peak):
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'name': name,
+        'pool_size': pool_size,
+        'calls': len(latencies),
+        'total_s': float(latencies_ms.sum() / 1000),
+        'throughput_per_s': float(len(latencies) / (latencies_ms.sum() / 1000)),
+        'latency_ms': {
+            'mean': float(latencies_ms.mean()),
+            'p50': float(np.percentile(latencies_ms, 50)),
+            'p90': float(np.percentile(latencies_ms, 90)),
+            'p99': float(np.percentile(latencies_ms, 99)),
+            'max': float(latencies_ms.max()),
+        },
+        'peak_memory_bytes': int(peak),
+    }
+
+
+class Benchmarks:
+    def __init__(self, corpus, solver_cls=GreedyEntropySolver, guesses=None, seed=0, min_calls=5, min_time=0.5):
+        self.corpus = corpus
+        self.solver_cls = solver_cls
+        self.guesses = guesses
+        self.random = random.Random(seed)
+        self.min_calls = min_calls
+        self.min_time = min_time
+        self.solver = self.new_solver(corpus)
+        # every runner gets a cold cache file of its own, clearing the shared cache would drop the cached
+        # entropies of every solver on the same corpus
+        self.cache_dir = tempfile.TemporaryDirectory(prefix='wordle-bench-')
+        self.num_runners = 0
+
+    def new_solver(self, corpus):
+        if self.guesses:
+            return self.solver_cls(corpus=corpus, guesses=self.guesses)
+        return self.solver_cls(corpus=corpus)
+
+    def pool(self, pool_size):
+        return self.random.sample(self.corpus, pool_size)
+
+    def run(self, name, pool_size):
+        # solvers and runners print on every turn, keep that out of the timings and the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            args_list, fn = getattr(self, f'setup_{name}')(pool_size)
+            fn(*args_list[0])  # warm up caches the way a long running process would have them
+            latencies = measure(fn, args_list, self.min_calls, self.min_time)
+            peak = peak_memory(fn, args_list[0])
+        return summarize(name, pool_size, latencies, peak)
+
+    def setup_get_entropy(self, pool_size):
+        self.solver.pool = self.pool(pool_size)
+        return [(w,) for w in self.pool(min(pool_size, 32))], self.solver.get_entropy
+
+    def setup_get_possibilities(self, pool_size):
+        self.solver.pool = self.pool(pool_size)
+        args_list = []
+        for guess in self.pool(min(pool_size, 32)):
+            args_list += [(guess, Wordle.score(guess, self.random.choice(self.solver.pool)))]
+        return args_list, self.solver.get_possibilities
+
+    def setup_get_best_guess(self, pool_size):
+        pool = self.pool(pool_size)
+
+        def get_best_guess():
+            self.solver.pool = pool
+            self.solver.get_best_guess()
+        return [()], get_best_guess
+
+    def new_runner(self, corpus):
+        if not os.path.isdir('./entropies'):
+            os.mkdir('./entropies')
+        self.num_runners += 1
+        cache_path = os.path.join(self.cache_dir.name, f'entropies-{self.num_runners}.sqlite')
+        return Runner(corpus_name='benchmark', wordle=Wordle(corpus=corpus), solver=self.new_solver(corpus),
+                      seed=0, debug_log=False, cache_path=cache_path)
+
+    def setup_play(self, pool_size):
+        corpus = self.pool(pool_size)
+        runner = self.new_runner(corpus)
+        return [(target,) for target in corpus[:32]], lambda target: runner.play(target=target)
+
+    def setup_play_all(self, pool_size):
+        corpus = self.pool(pool_size)
+
+        def play_all():
+            runner = self.new_runner(corpus)
+            runner.play_all()
+        return [()], play_all
+
+
+def run(args):
+    corpus = Solver.default_corpus()
+    if args.corpus:
+        with open(args.corpus, 'r') as f:
+            corpus = [line.strip() for line in f.readlines()]
+    guesses = Solver.allowed_guesses() if args.allowed_guesses else None
+    benchmarks = Benchmarks(corpus, SOLVERS[args.solver], guesses, args.seed, args.min_calls, args.min_time)
+    pool_sizes = args.pool_sizes if args.pool_sizes else default_pool_sizes(len(corpus))
+    results = []
+    for name in args.benchmarks:
+        for pool_size in pool_sizes:
+            if name == 'play_all' and pool_size > args.max_play_all:
+                continue
+            result = benchmarks.run(name, min(pool_size, len(corpus)))
+            print(f'{name:>18} {result["pool_size"]:>6} words  p50 {result["latency_ms"]["p50"]:10.3f} ms  '
+                  f'p99 {result["latency_ms"]["p99"]:10.3f} ms  {result["throughput_per_s"]:10.1f}/s  '
+                  f'peak {result["peak_memory_bytes"] / 2 ** 20:8.1f} MB', file=sys.stderr)
+            results += [result]
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'solver': args.solver,
+            'allowed_guesses': args.allowed_guesses,
+            'corpus_size': len(corpus),
+            'max_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') if args.output else contextlib.nullcontext(sys.stdout) as f:
+        json.dump(report, f, indent=2)
+    return 0
+
+
+def compare_reports(base, new, threshold=0.1, metric='p50', min_memory_delta=2 ** 20):
+    # a benchmark regresses when its latency or peak memory grows by more than threshold,
+    # memory only counts past min_memory_delta bytes so tiny peaks don't flap
+    base_results = {(r['name'], r['pool_size']): r for r in base['results']}
+    rows = []
+    for result in new['results']:
+        key = (result['name'], result['pool_size'])
+        if key not in base_results:
+            continue
+        base_result = base_results[key]
+        latency_ratio = result['latency_ms'][metric] / max(base_result['latency_ms'][metric], 1e-9)
+        memory_ratio = result['peak_memory_bytes'] / max(base_result['peak_memory_bytes'], 1)
+        rows += [{
+            'name': result['name'],
+            'pool_size': result['pool_size'],
+            'base_ms': base_result['latency_ms'][metric],
+            'new_ms': result['latency_ms'][metric],
+            'latency_ratio': latency_ratio,
+            'memory_ratio': memory_ratio,
+            'regression': latency_ratio > 1 + threshold or (
+                memory_ratio > 1 + threshold
+                and result['peak_memory_bytes'] - base_result['peak_memory_bytes'] > min_memory_delta),
+        }]
+    return rows
+
+
+def compare(args):
+    with open(args.base, 'r') as f:
+        base = json.load(f)
+    with open(args.new, 'r') as f:
+        new = json.load(f)
+    rows = compare_reports(base, new, args.threshold, args.metric)
+    for row in rows:
+        flag = 'REGRESSION' if row['regression'] else ''
+        print(f'{row["name"]:>18} {row["pool_size"]:>6} words  {row["base_ms"]:10.3f} -> {row["new_ms"]:10.3f} ms  '
+              f'x{row["latency_ratio"]:5.2f} time  x{row["memory_ratio"]:5.2f} memory  {flag}')
+    return 1 if any(row['regression'] for row in rows) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='benchmarks for the solver hot paths')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run_parser = subparsers.add_parser('run', help='time the hot paths and write a JSON report')
+    run_parser.add_argument('--output', help='JSON report path, stdout by default')
+    run_parser.add_argument('--benchmarks', nargs='+', choices=BENCHMARKS, default=BENCHMARKS)
+    run_parser.add_argument('--pool-sizes', nargs='+', type=int)
+    run_parser.add_argument('--max-play-all', type=int, default=1024, help='largest corpus play_all runs on')
+    run_parser.add_argument('--corpus', help='word list file, default corpus otherwise')
+    run_parser.add_argument('--solver', choices=SOLVERS, default='greedy')
+    run_parser.add_argument('--allowed-guesses', action='store_true')
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--min-calls', type=int, default=5)
+    run_parser.add_argument('--min-time', type=float, default=0.5, help='seconds spent timing each benchmark')
+    run_parser.set_defaults(func=run)
+    compare_parser = subparsers.add_parser('compare', help='compare two reports, exit 1 on regressions')
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='allowed relative slowdown')
+    compare_parser.add_argument('--metric', choices=['mean', 'p50', 'p90', 'p99', 'max'], default='p50')
+    compare_parser.set_defaults(func=compare)
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
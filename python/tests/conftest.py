@@ -1 +1,16 @@
+import pytest
+
 tol = (1 - 0.9999999999999)
+
+
+@pytest.fixture(scope='session')
+def official_wordle_corpus():
+    # shared by every test, slice it rather than change it
+    with open('./data/wordle_possible_answers.txt', 'r') as f:
+        return [line.strip() for line in f.readlines()]
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    # a fresh entropy cache per test, rows left by earlier runs would change what gets computed
+    return str(tmp_path / 'entropies.sqlite')
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from ..wordle_solver.analysis import WorstCaseAnalysis
+from ..wordle_solver.simulate import BatchSimulator
+from ..wordle_solver.solvers import GreedyEntropySolver
+
+
+def brute_force_minimax(patterns, pool_indices, memo):
+    # fewest guesses that solve every target, over every guess
+    if len(pool_indices) == 1:
+        return 1
+    key = pool_indices.tobytes()
+    if key not in memo:
+        best = np.inf
+        for guess_index in range(len(patterns.guesses)):
+            row = patterns.matrix[guess_index, pool_indices]
+            partitions = [pool_indices[row == code] for code in np.unique(row) if code != patterns.num_patterns - 1]
+            if len(partitions) == 1 and len(partitions[0]) == len(pool_indices):
+                continue
+            best = min(best, 1 + max([brute_force_minimax(patterns, p, memo) for p in partitions] + [0]))
+        memo[key] = best
+    return memo[key]
+
+
+class TestWorstCaseAnalysis:
+    def test_policy_matches_simulation(self, official_wordle_corpus):
+        corpus = official_wordle_corpus[:400]
+        solver = GreedyEntropySolver(corpus=corpus)
+        for opening in [None, 'clamp']:
+            nums_of_tries = BatchSimulator(solver).run(corpus, opening)
+            worst = max(nums_of_tries.values())
+            analysis = WorstCaseAnalysis(solver)
+            assert analysis.policy_worst_case(opening) == (
+                worst, sorted(t for t, n in nums_of_tries.items() if n == worst))
+        assert list(solver.pool_indices) == list(range(len(corpus)))
+
+    def test_minimax_matches_brute_force(self, official_wordle_corpus):
+        corpus = official_wordle_corpus[:50]
+        solver = GreedyEntropySolver(corpus=corpus)
+        expected = brute_force_minimax(solver.patterns, solver.pool_indices, {})
+        analysis = WorstCaseAnalysis(solver, top_k=None)
+        worst, targets = analysis.minimax_worst_case(depth_limit=6)
+        assert worst == expected
+        assert targets
+        assert WorstCaseAnalysis(solver, top_k=None).minimax_worst_case(depth_limit=expected - 1) == (None, [])
+
+    def test_minimax_not_worse_than_policy(self, official_wordle_corpus):
+        corpus = official_wordle_corpus[:400]
+        solver = GreedyEntropySolver(corpus=corpus)
+        policy_worst, _ = WorstCaseAnalysis(solver).policy_worst_case('clamp')
+        worst, targets = WorstCaseAnalysis(solver).minimax_worst_case('clamp', depth_limit=policy_worst)
+        assert worst <= policy_worst
+        assert set(targets) <= set(corpus)
+
+    def test_unknown_opening(self, official_wordle_corpus):
+        corpus = official_wordle_corpus[:400]
+        with pytest.raises(ValueError):
+            WorstCaseAnalysis(GreedyEntropySolver(corpus=corpus)).policy_worst_case('zzzzz')
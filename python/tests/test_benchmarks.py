@@ -0,0 +1,44 @@
+import json
+from ..benchmarks.bench_solvers import Benchmarks, compare_reports, default_pool_sizes, main
+
+
+def report(p50, peak):
+    return {'results': [{'name': 'get_best_guess', 'pool_size': 16, 'latency_ms': {'p50': p50},
+                         'peak_memory_bytes': peak}]}
+
+
+class TestBenchmarks:
+    def test_default_pool_sizes(self):
+        assert default_pool_sizes(3578) == [2, 16, 128, 1024, 3578]
+        assert default_pool_sizes(10) == [2, 10]
+
+    def test_compare_reports(self):
+        assert not compare_reports(report(1., 2 ** 22), report(1.05, 2 ** 22))[0]['regression']
+        assert compare_reports(report(1., 2 ** 22), report(1.5, 2 ** 22))[0]['regression']
+        assert compare_reports(report(1., 2 ** 22), report(1., 2 ** 23))[0]['regression']
+        assert not compare_reports(report(1., 100), report(1., 200))[0]['regression']
+        assert compare_reports(report(1., 100), {'results': []}) == []
+
+    def test_run_and_compare(self, tmp_path):
+        corpus_file = tmp_path / 'corpus.txt'
+        with open('./data/wordle_possible_answers.txt', 'r') as f:
+            corpus_file.write_text(''.join(f.readlines()[:64]))
+        output = tmp_path / 'bench.json'
+        assert main(['run', '--corpus', str(corpus_file), '--pool-sizes', '2', '16', '--min-calls', '2',
+                     '--min-time', '0', '--output', str(output)]) == 0
+        with open(output, 'r') as f:
+            results = json.load(f)['results']
+        assert [(r['name'], r['pool_size']) for r in results] == [
+            (name, size) for name in ['get_entropy', 'get_possibilities', 'get_best_guess', 'play', 'play_all']
+            for size in [2, 16]]
+        for result in results:
+            assert result['calls'] >= 2
+            assert result['latency_ms']['p50'] <= result['latency_ms']['max']
+        assert main(['compare', str(output), str(output)]) == 0
+
+    def test_runners_use_their_own_cache(self):
+        corpus = ['aaaaa', 'abbbb', 'aaccc', 'aaadd', 'aaaae', 'fffff']
+        benchmarks = Benchmarks(corpus)
+        paths = [benchmarks.new_runner(corpus).cache.path for _ in range(2)]
+        assert paths[0] != paths[1]
+        assert all(path.startswith(benchmarks.cache_dir.name) for path in paths)
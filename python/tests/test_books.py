@@ -0,0 +1,66 @@
+import pytest
+from ..wordle_solver.books import OpeningBook
+from ..wordle_solver.solvers import BookSolver, GreedyEntropySolver
+from ..wordle_solver.wordle import Wordle
+from ..wordle_solver.runners import Runner
+
+
+class TestOpeningBook:
+    def test_build(self, official_wordle_corpus):
+        corpus = official_wordle_corpus[:300]
+        solver = GreedyEntropySolver(corpus=corpus)
+        book = OpeningBook.build(solver)
+        assert book.guess(0)[0] == solver.get_best_guess()[0]
+        assert solver.pool == corpus
+        # every answer is reached through the book
+        for target in corpus:
+            node = 0
+            for _ in range(len(corpus)):
+                guess, _ = book.guess(node)
+                outcome = Wordle.score(guess, target)
+                if guess == target:
+                    break
+                node = book.child(node, outcome)
+            assert guess == target
+
+    def test_save_and_load(self, official_wordle_corpus, tmp_path):
+        corpus = official_wordle_corpus[:300]
+        book = OpeningBook.build(GreedyEntropySolver(corpus=corpus), opening='raise')
+        assert book.guess(0)[0] == 'raise'
+        book.save(tmp_path / 'book.npz')
+        loaded = OpeningBook.load(tmp_path / 'book.npz')
+        assert loaded.answers == book.answers
+        assert loaded.solver_config == book.solver_config
+        assert [loaded.guess(n) for n in range(len(loaded))] == [book.guess(n) for n in range(len(book))]
+        assert loaded.edges == book.edges
+
+    def test_book_solver_plays_like_greedy(self, official_wordle_corpus, cache_path):
+        corpus = official_wordle_corpus[:300]
+        greedy_solver = GreedyEntropySolver(corpus=corpus)
+        book_solver = BookSolver(OpeningBook.build(greedy_solver))
+        greedy_runner = Runner(corpus_name='test_book_corpus', wordle=Wordle(corpus=corpus), solver=greedy_solver,
+                               cache_path=cache_path)
+        book_runner = Runner(corpus_name='test_book_corpus', wordle=Wordle(corpus=corpus), solver=book_solver,
+                             cache_path=cache_path)
+        for target in corpus:
+            greedy_runner.play(target=target)
+            book_runner.play(target=target)
+            assert book_runner.wordle.num_guesses == greedy_runner.wordle.num_guesses
+
+    def test_book_solver_off_book(self, official_wordle_corpus):
+        corpus = official_wordle_corpus[:300]
+        solver = BookSolver(OpeningBook.build(GreedyEntropySolver(corpus=corpus), opening='raise'))
+        with pytest.raises(ValueError):
+            solver.update_pool('zzzzz', [0, 0, 0, 0, 0])
+
+    def test_books_do_not_share_cache_rows(self, official_wordle_corpus, cache_path):
+        corpus = official_wordle_corpus[:300]
+        raise_book = OpeningBook.build(GreedyEntropySolver(corpus=corpus), opening='raise')
+        default_book = OpeningBook.build(GreedyEntropySolver(corpus=corpus))
+        assert raise_book.guess(0)[0] != default_book.guess(0)[0]
+        assert BookSolver(raise_book).config != BookSolver(default_book).config
+        for book in [raise_book, default_book]:
+            runner = Runner(corpus_name='test_book_corpus', wordle=Wordle(corpus=corpus),
+                            solver=BookSolver(book), cache_path=cache_path)
+            assert runner.init_best_guess == book.guess(0)[0]
+            runner.play(target=corpus[0])
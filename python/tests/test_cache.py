@@ -0,0 +1,51 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from ..wordle_solver.cache import EntropyCache
+
+corpus = ['aaaaa', 'abbbb', 'aaccc', 'aaadd', 'aaaae', 'fffff']
+
+
+def _put_and_get(args):
+    cache, guess = args
+    cache.put([(guess, [0, 0, 0, 0, 0])], guess, {guess: 1.})
+    return cache.get_best_guess([(guess, [0, 0, 0, 0, 0])])
+
+
+class TestEntropyCache:
+    def test_put_and_get(self, tmp_path):
+        cache = EntropyCache(str(tmp_path / 'cache.sqlite'), 'test', corpus, 'solver-v1')
+        assert cache.get_best_guess([]) is None
+        assert cache.get([]) == (None, None)
+        cache.put([], 'aaaaa', {'aaaaa': 2., 'fffff': 1.})
+        cache.put([('aaaaa', [2, 0, 0, 0, 0])], 'abbbb', {'abbbb': 0.})
+        assert cache.get_best_guess([]) == 'aaaaa'
+        assert cache.get([]) == ('aaaaa', {'aaaaa': 2., 'fffff': 1.})
+        assert cache.get_best_guess([('aaaaa', [2, 0, 0, 0, 0])]) == 'abbbb'
+        assert cache.get_best_guess([('aaaaa', [2, 2, 0, 0, 0])]) is None
+
+    def test_keyed_by_solver_config(self, tmp_path):
+        path = str(tmp_path / 'cache.sqlite')
+        EntropyCache(path, 'test', corpus, 'solver-v1').put([], 'aaaaa')
+        assert EntropyCache(path, 'test', corpus, 'solver-v2').get_best_guess([]) is None
+        assert EntropyCache(path, 'test', list(reversed(corpus)), 'solver-v1').get_best_guess([]) is None
+
+    def test_prune_stale(self, tmp_path):
+        path = str(tmp_path / 'cache.sqlite')
+        EntropyCache(path, 'test', corpus, 'solver-v1').put([], 'aaaaa')
+        EntropyCache(path, 'other', corpus[:2], 'solver-v1').put([], 'abbbb')
+        # processes on other corpora under the same name don't drop each other's rows
+        EntropyCache(path, 'test', corpus[:3], 'solver-v1').put([], 'aaccc')
+        assert EntropyCache(path, 'test', corpus, 'solver-v1').get_best_guess([]) == 'aaaaa'
+        EntropyCache(path, 'test', corpus[:3], 'solver-v1').prune_stale()
+        assert EntropyCache(path, 'test', corpus, 'solver-v1').get_best_guess([]) is None
+        assert EntropyCache(path, 'test', corpus[:3], 'solver-v1').get_best_guess([]) == 'aaccc'
+        assert EntropyCache(path, 'other', corpus[:2], 'solver-v1').get_best_guess([]) == 'abbbb'
+
+    def test_concurrent_writers(self, tmp_path):
+        cache = EntropyCache(str(tmp_path / 'cache.sqlite'), 'test', corpus, 'solver-v1')
+        cache = pickle.loads(pickle.dumps(cache))
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(_put_and_get, [(cache, w) for w in corpus * 5]))
+        assert results == corpus * 5
+        for w in corpus:
+            assert cache.get([(w, [0, 0, 0, 0, 0])]) == (w, {w: 1.})
@@ -0,0 +1,30 @@
+from collections import Counter
+from ..wordle_solver.constraints import ConstraintIndex
+
+
+class TestConstraintIndex:
+    words = ['abcde', 'eycby', 'excbx', 'excbd', 'excxx', 'ebcxx', 'eycyy', 'zzggg', 'zzzgg']
+    index = ConstraintIndex(words)
+
+    def test_bits_round_trip(self):
+        mask = [i % 3 == 0 for i in range(len(self.words))]
+        assert list(self.index.to_mask(self.index.to_bits(mask))) == mask
+        assert self.index.to_mask(self.index.all).all()
+
+    def test_position_and_count_tables(self):
+        assert list(self.index.to_mask(self.index.positions[2]['c'])) == ['c' == w[2] for w in self.words]
+        assert list(self.index.to_mask(self.index.count_bits('x', 2, exact=False))) == \
+            [w.count('x') >= 2 for w in self.words]
+        assert list(self.index.to_mask(self.index.count_bits('x', 1, exact=True))) == \
+            [w.count('x') == 1 for w in self.words]
+        assert self.index.count_bits('q', 0, exact=True) == self.index.all
+        assert self.index.count_bits('q', 1, exact=False) == 0
+
+    def test_matches(self):
+        # 'abcde' with [0, 1, 2, 0, 1]
+        matches = self.index.matches([None, None, 'c', None, None], Counter({'b': 1, 'e': 1}),
+                                     [None, 'b', None, None, 'e'], {'a', 'd'})
+        assert [w for w, m in zip(self.words, matches) if m] == ['eycby', 'excbx']
+        # 'ggaaa' with [1, 1, 0, 0, 0]
+        matches = self.index.matches([None] * 5, Counter({'g': 2}), ['g', 'g', None, None, None], {'a'})
+        assert [w for w, m in zip(self.words, matches) if m] == ['zzggg', 'zzzgg']
@@ -0,0 +1,54 @@
+import pytest
+from ..wordle_solver import corpus as corpus_module
+from ..wordle_solver.corpus import Corpus, load_corpus, source_hash
+from ..wordle_solver.solvers import Solver
+from ..wordle_solver.wordle import Wordle
+
+
+class TestCorpus:
+    words = ['aaaaa', 'abbbb', 'aaccc', 'aaadd']
+
+    def test_from_words(self):
+        corpus = Corpus.from_words(self.words)
+        assert len(corpus) == len(self.words)
+        assert corpus.words == self.words
+        assert corpus.array.shape == (4, 5)
+        assert corpus.hash != Corpus.from_words(list(reversed(self.words))).hash
+        with pytest.raises(ValueError):
+            Corpus.from_words(['aaaaa', 'bbbb'])
+
+    def test_save_and_load(self, tmp_path):
+        path = str(tmp_path / 'corpus.bin')
+        corpus = Corpus.from_words(self.words)
+        corpus.save(path, source_hash('v1'))
+        loaded = Corpus.load(path, source_hash('v1'))
+        assert loaded.words == self.words
+        assert loaded.hash == corpus.hash
+        assert Corpus.load(path, source_hash('v2')) is None
+        assert Corpus.load(str(tmp_path / 'missing.bin')) is None
+
+    def test_load_corpus_builds_once(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(corpus_module, 'CORPUS_DIR', str(tmp_path))
+        monkeypatch.setattr(corpus_module, '_loaded', {})
+        builds = []
+
+        def build():
+            builds.append(1)
+            return self.words
+        assert load_corpus('test', build, lambda: ['v1']).words == self.words
+        assert load_corpus('test', build, lambda: ['v1']) is load_corpus('test', build, lambda: ['v1'])
+        monkeypatch.setattr(corpus_module, '_loaded', {})
+        assert load_corpus('test', build, lambda: ['v1']).words == self.words
+        assert len(builds) == 1
+        monkeypatch.setattr(corpus_module, '_loaded', {})
+        load_corpus('test', build, lambda: ['v2'])
+        assert len(builds) == 2
+
+    def test_default_corpus_is_shared(self):
+        assert Solver.default_corpus() is Solver.default_corpus()
+        # the same words in the same order whatever the hash seed of the process that built it
+        assert Solver.default_corpus() == Solver.build_default_corpus()
+        assert Solver.build_default_corpus(4) == sorted(Solver.build_default_corpus(4))
+        wordle = Wordle()
+        wordle.new_game()
+        assert len(wordle.corpus) == len(Solver.default_corpus()) - 1
@@ -0,0 +1,71 @@
+from ..wordle_solver.metrics import metrics, PrometheusTextExporter, Registry
+from ..wordle_solver.runners import Runner
+from ..wordle_solver.solvers import GreedyEntropySolver
+from ..wordle_solver.wordle import Wordle
+
+
+class TestRegistry:
+    def test_disabled_records_nothing(self):
+        registry = Registry()
+        registry.inc('games')
+        registry.observe('pool_size', 10)
+        with registry.timer('turn_seconds'):
+            pass
+        assert registry.snapshot() == {'counters': [], 'summaries': []}
+
+    def test_counters_and_summaries(self):
+        registry = Registry(enabled=True)
+        registry.inc('cache_hits')
+        registry.inc('cache_hits', 2)
+        registry.inc('service_requests', op='new')
+        registry.observe('pool_size', 10)
+        registry.observe('pool_size', 4)
+        with registry.timer('turn_seconds', turn=2):
+            pass
+        snapshot = registry.snapshot()
+        assert {(c['name'], tuple(c['labels'].items())): c['value'] for c in snapshot['counters']} == {
+            ('cache_hits', ()): 3, ('service_requests', (('op', 'new'),)): 1}
+        pool_size, turn_seconds = snapshot['summaries']
+        assert (pool_size['count'], pool_size['sum'], pool_size['max']) == (2, 14, 10)
+        assert turn_seconds['labels'] == {'turn': 2} and turn_seconds['count'] == 1
+
+    def test_prometheus_text(self, tmp_path):
+        registry = Registry(enabled=True)
+        registry.inc('service_requests', op='new')
+        registry.inc('service_requests', op='sug"gest')
+        registry.observe('pool_size', 10)
+        path = str(tmp_path / 'wordle.prom')
+        registry.exporters += [PrometheusTextExporter(path)]
+        text, = registry.export()
+        assert text.splitlines() == [
+            '# TYPE wordle_service_requests_total counter',
+            'wordle_service_requests_total{op="new"} 1',
+            'wordle_service_requests_total{op="sug\\"gest"} 1',
+            '# TYPE wordle_pool_size summary',
+            'wordle_pool_size_count 1',
+            'wordle_pool_size_sum 10',
+            '# TYPE wordle_pool_size_max gauge',
+            'wordle_pool_size_max 10',
+        ]
+        with open(path, 'r') as f:
+            assert f.read() == text
+
+    def test_runner_metrics(self, tmp_path):
+        corpus = ['aaaaa', 'abbbb', 'aaccc', 'aaadd', 'aaaae', 'fffff', 'ffffa']
+        runner = Runner(corpus_name='test_metrics_corpus', wordle=Wordle(corpus=corpus),
+                        solver=GreedyEntropySolver(corpus=corpus), debug_log=False,
+                        cache_path=str(tmp_path / 'entropies.sqlite'))
+        metrics.enabled = True
+        try:
+            for target in corpus:
+                runner.play(target=target)
+            snapshot = metrics.snapshot()
+        finally:
+            metrics.enabled = False
+            metrics.reset()
+        counters = {c['name']: c['value'] for c in snapshot['counters'] if not c['labels']}
+        assert counters['games'] == len(corpus)
+        # the cache starts empty, so the first game past the opening has to miss
+        assert counters.get('cache_misses', 0) >= 1
+        assert counters.get('cache_hits', 0) + counters.get('cache_misses', 0) == counters['games'] - 1
+        assert any(s['name'] == 'turn_seconds' for s in snapshot['summaries'])
@@ -0,0 +1,74 @@
+import random
+import pytest
+import numpy as np
+from ..wordle_solver.patterns import PatternMatrix
+from ..wordle_solver.solvers import EntropySolver, Solver
+from ..wordle_solver.wordle import Wordle
+
+
+class TestPatternMatrix:
+    words = ['levee', 'eeeee', 'velee', 'veeez', 'lllll', 'zllll', 'ezezz', 'abcde', 'edcba', 'zzcba',
+             'gases', 'james', 'oases', 'hades', 'reese', 'ezeze', 'ezeee', 'kneed', 'raise']
+
+    def test_matches_wordle_score(self):
+        patterns = PatternMatrix(self.words)
+        for guess in self.words:
+            for target in self.words:
+                code = patterns.matrix[patterns.guess_index[guess], patterns.answer_index[target]]
+                assert PatternMatrix.outcome(code, 5) == Wordle.score(guess, target), (guess, target)
+
+    def test_matches_wordle_score_on_corpus(self):
+        corpus = Solver.default_corpus()
+        random.seed(0)
+        guesses, answers = random.sample(corpus, 200), random.sample(corpus, 200)
+        patterns = PatternMatrix(guesses, answers)
+        for i, guess in enumerate(guesses):
+            for j, target in enumerate(answers):
+                assert patterns.matrix[i, j] == PatternMatrix.pattern_code(Wordle.score(guess, target))
+
+    def test_pattern_code_matches_all_outcomes(self):
+        outcomes = Solver.all_outcomes((0, 1, 2), 5)
+        for code, outcome in enumerate(outcomes):
+            assert PatternMatrix.pattern_code(outcome) == code
+            assert PatternMatrix.outcome(code, 5) == outcome
+
+    def test_row_for_unknown_guess(self):
+        patterns = PatternMatrix(self.words[:5])
+        row = patterns.row('zllll')
+        assert [PatternMatrix.outcome(c, 5) for c in row] == [Wordle.score('zllll', w) for w in self.words[:5]]
+        assert list(patterns.row('zllll', [1, 3])) == [row[1], row[3]]
+
+    def test_entropies(self):
+        patterns = PatternMatrix(Solver.default_corpus()[:400])
+        guess_indices = np.arange(400)
+        for answer_indices in [np.arange(400), np.arange(0, 400, 7), np.array([3, 5])]:
+            # reference: one plain bincount per guess
+            histograms = np.array([np.bincount(patterns.matrix[g, answer_indices], minlength=patterns.num_patterns)
+                                   for g in guess_indices])
+            expected = EntropySolver.calc_entropy(histograms / len(answer_indices))
+            assert np.allclose(patterns.entropies(guess_indices, answer_indices), expected)
+
+    def test_longer_words_and_other_alphabets(self):
+        for words in [['levees', 'eeeeee', 'veleez', 'zzllll', 'reseed', 'ezezez'],
+                      ['spectrum', 'spectral', 'assessed', 'messages', 'eeeeeeee', 'rusttest'],
+                      ['12+35=47', '9*8-2=70', '10-1*9=1', '77+11=88', '3*3*3=27'],
+                      ['ääkkö', 'ököää', 'äääää', 'kökkö']]:
+            patterns = PatternMatrix(words)
+            word_len = len(words[0])
+            assert patterns.matrix.dtype == (np.uint8 if word_len <= 5 else np.uint16)
+            for guess in words:
+                for target in words:
+                    code = patterns.matrix[patterns.guess_index[guess], patterns.answer_index[target]]
+                    assert PatternMatrix.outcome(int(code), word_len) == Wordle.score(guess, target)
+        assert PatternMatrix.pattern_dtype(11) == np.uint32
+
+    def test_mixed_lengths_rejected(self):
+        with pytest.raises(ValueError):
+            PatternMatrix(['abcde', 'abcdef'])
+
+    def test_joint_entropies(self):
+        patterns = PatternMatrix(Solver.default_corpus()[:400])
+        guess_indices = np.arange(0, 400, 3)
+        pools = [np.arange(400), np.arange(0, 400, 7), np.array([3, 5]), np.arange(0, 400, 7), np.array([9])]
+        expected = sum(patterns.entropies(guess_indices, pool) for pool in pools)
+        assert np.allclose(patterns.joint_entropies(guess_indices, pools, chunk_size=50), expected)
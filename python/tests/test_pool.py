@@ -0,0 +1,75 @@
+import random
+import numpy as np
+import pytest
+from ..wordle_solver.pool import WordPool
+from ..wordle_solver.solvers import GreedyEntropySolver
+from ..wordle_solver.wordle import Wordle
+
+
+class TestWordPool:
+    words = ['aaaaa', 'bbbbb', 'ccccc', 'ddddd', 'eeeee']
+
+    def test_sequence(self):
+        pool = WordPool(self.words, np.array([3, 0, 4]))
+        assert len(pool) == 3
+        assert list(pool) == ['ddddd', 'aaaaa', 'eeeee']
+        assert pool[1] == 'aaaaa' and pool[-1] == 'eeeee'
+        assert pool[1:] == ['aaaaa', 'eeeee']
+        assert 'aaaaa' in pool and 'bbbbb' not in pool and 'zzzzz' not in pool
+        assert pool == WordPool(self.words, np.array([3, 0, 4]))
+
+    def test_views_share_the_vocabulary(self):
+        pool = WordPool(self.words)
+        sub_pool = pool.subset(np.array([True, False, True, False, True]))
+        assert sub_pool.words is pool.words
+        assert sub_pool == ['aaaaa', 'ccccc', 'eeeee']
+        assert pool.intersection(sub_pool) == sub_pool
+        assert sub_pool.intersection(WordPool(self.words, np.array([4, 1, 2]))) == ['ccccc', 'eeeee']
+        assert list(np.flatnonzero(sub_pool.mask())) == [0, 2, 4]
+        with pytest.raises(ValueError):
+            pool.intersection(WordPool(list(self.words)))
+
+    def test_remove(self):
+        pool = WordPool(self.words)
+        view = pool[:]
+        pool.remove('ccccc')
+        assert pool == ['aaaaa', 'bbbbb', 'ddddd', 'eeeee']
+        assert len(view) == 5
+        with pytest.raises(ValueError):
+            pool.remove('ccccc')
+        with pytest.raises(ValueError):
+            pool.remove('zzzzz')
+
+    def test_duplicate_words(self):
+        pool = WordPool(['aaaaa', 'bbbbb', 'aaaaa', 'ccccc'])
+        pool.remove('aaaaa')
+        assert 'aaaaa' in pool
+        pool.remove('aaaaa')
+        assert 'aaaaa' not in pool
+        assert pool == ['bbbbb', 'ccccc']
+        wordle = Wordle(corpus=['aaaaa', 'bbbbb', 'aaaaa', 'ccccc'], seed=0)
+        targets = [wordle.new_game() for _ in range(4)]
+        assert sorted(targets) == ['aaaaa', 'aaaaa', 'bbbbb', 'ccccc']
+        assert wordle.new_game() is None
+
+    def test_wordle_draws_like_a_list(self):
+        corpus = [''.join(random.Random(i).choices('abcdefgh', k=5)) for i in range(50)]
+        wordle = Wordle(corpus=corpus, seed=3)
+        assert wordle.corpus.words is corpus
+        expected, remaining = [], list(corpus)
+        while remaining:
+            random.seed(3)
+            expected += [random.choice(remaining)]
+            remaining.remove(expected[-1])
+        assert [wordle.new_game() for _ in corpus] == expected
+        assert corpus == [''.join(random.Random(i).choices('abcdefgh', k=5)) for i in range(50)]
+
+    def test_solver_pool_is_a_view(self):
+        solver = GreedyEntropySolver(corpus=self.words)
+        assert solver.pool == self.words
+        assert solver.pool.words is solver.patterns.answers
+        solver.update_pool('aaaaa', [0] * 5)
+        assert solver.pool == ['bbbbb', 'ccccc', 'ddddd', 'eeeee']
+        assert solver.get_possibilities('bbbbb', [0] * 5, solver.pool) == ['ccccc', 'ddddd', 'eeeee']
+        solver.reset()
+        assert solver.pool == self.words
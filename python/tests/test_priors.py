@@ -0,0 +1,17 @@
+import numpy as np
+from ..wordle_solver import priors as priors_module
+from ..wordle_solver.priors import frequency_priors
+
+
+class TestFrequencyPriors:
+    def test_common_words_weigh_more(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(priors_module, 'CORPUS_DIR', str(tmp_path))
+        words = ['house', 'water', 'zloty', 'xylyl', 'qqqqq']
+        weights = frequency_priors(words)
+        assert weights.shape == (len(words),)
+        assert weights[0] > weights[2] > 0 and weights[1] > weights[3]
+        assert weights.min() > 0 and weights.max() <= 1
+        assert len(list(tmp_path.glob('priors-*.npy'))) == 1
+        assert frequency_priors(words) is weights
+        priors_module._loaded.clear()
+        assert np.array_equal(frequency_priors(words), weights)
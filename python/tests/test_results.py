@@ -0,0 +1,45 @@
+import statistics
+import pytest
+from ..wordle_solver.results import ResultsSink, RunningStats
+
+
+class TestResultsSink:
+    def test_append_and_read_back(self, tmp_path):
+        path = str(tmp_path / 'results.jsonl')
+        sink = ResultsSink(path, 'solver-v1', 'abc')
+        assert sink.records() == []
+        with sink.open() as f:
+            ResultsSink.write(f, {'target': 'aaaaa', 'num_guesses': 2})
+        with sink.open() as f:
+            ResultsSink.write(f, {'target': 'bbbbb', 'num_guesses': 3})
+        assert [r['target'] for r in sink.records()] == ['aaaaa', 'bbbbb']
+
+    def test_truncated_line_is_dropped(self, tmp_path):
+        path = str(tmp_path / 'results.jsonl')
+        sink = ResultsSink(path, 'solver-v1', 'abc')
+        with sink.open() as f:
+            ResultsSink.write(f, {'target': 'aaaaa', 'num_guesses': 2})
+            f.write('{"target": "bbbbb", "num_gu')
+        assert [r['target'] for r in sink.records()] == ['aaaaa']
+        with sink.open() as f:
+            ResultsSink.write(f, {'target': 'ccccc', 'num_guesses': 4})
+        assert [r['target'] for r in sink.records()] == ['aaaaa', 'ccccc']
+
+    def test_other_run_rejected(self, tmp_path):
+        path = str(tmp_path / 'results.jsonl')
+        with ResultsSink(path, 'solver-v1', 'abc').open():
+            pass
+        with pytest.raises(ValueError):
+            ResultsSink(path, 'solver-v2', 'abc').records()
+
+
+class TestRunningStats:
+    def test_matches_batch_stats(self):
+        values = [3, 4, 2, 5, 3, 3, 6, 4]
+        stats = RunningStats()
+        for v in values:
+            stats.add(v)
+        assert stats.mean == pytest.approx(statistics.mean(values))
+        assert stats.std == pytest.approx(statistics.pstdev(values))
+        assert (stats.min, stats.max, stats.count) == (2, 6, len(values))
+        assert stats.summary()['histogram'] == {2: 1, 3: 3, 4: 2, 5: 1, 6: 1}
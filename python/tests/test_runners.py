@@ -1,46 +1,123 @@
+import json
+import numpy as np
 import pytest
-from ..wordle_solver.solvers import GreedyEntropySolver, Solver
-from ..wordle_solver.wordle import Wordle
-from ..wordle_solver.runners import Runner
-
-
-@pytest.fixture(scope='class')
-def official_wordle_corpus():
-    with open('./data/wordle_possible_answers.txt', 'r') as f:
-        wordle_official_list = [line.strip() for line in f.readlines()]
-    return wordle_official_list
+from ..wordle_solver.solvers import GreedyEntropySolver, LookaheadSolver, MultiBoardSolver, Solver
+from ..wordle_solver.wordle import MultiWordle, Wordle
+from ..wordle_solver.runners import MultiRunner, Runner
 
 
 class TestRunner:
-    def test_init(self):
+    def test_init(self, cache_path):
         corpus = ['aaaaaa', 'abbbbb', 'aacccc', 'aaaddd', 'aaaaee', 'ffffff']
         best_guesses = ['aaaaaa', 'aaaaee']
         outcomes = Solver.all_outcomes(element_wise_outcomes=(0, 1, 2), size=6)
         solver = GreedyEntropySolver(corpus=corpus, outcomes=outcomes)
+        # 3^6 patterns don't fit in a byte, all correct has to come out as 728 and not wrap around
+        assert solver.patterns.matrix.dtype == np.uint16
+        assert solver.patterns.matrix.max() == 3 ** 6 - 1
         wordle = Wordle(corpus=corpus)
-        runner = Runner(corpus_name='test_corpus', wordle=wordle, solver=solver)
+        runner = Runner(corpus_name='test_corpus', wordle=wordle, solver=solver, cache_path=cache_path)
         assert runner.solver == solver
         assert runner.wordle == wordle
         assert runner.init_best_guess in best_guesses
 
-    def test_play(self):
+    def test_reordered_corpus_misses_the_cache(self, cache_path):
+        # bills and fills tie, the solver plays the first of them
+        for corpus in [['bills', 'fills'], ['fills', 'bills']]:
+            runner = Runner(corpus_name='test_order_corpus', wordle=Wordle(corpus=corpus),
+                            solver=GreedyEntropySolver(corpus=corpus), cache_path=cache_path)
+            assert runner.init_best_guess == GreedyEntropySolver(corpus=corpus).get_best_guess()[0] == corpus[0]
+
+    def test_play(self, cache_path):
         targets = ['aaron', 'ababa', 'abase', 'abide', 'abled', 'abode', 'abram', 'abuse']
-        runner = Runner()
+        runner = Runner(cache_path=cache_path)
         for target in targets:
             runner.play(target=target)
             assert runner.wordle.num_guesses <= 4
 
-    def test_play_all(self):
-        runner = Runner(seed=0)
+    def test_play_all(self, cache_path):
+        runner = Runner(seed=0, cache_path=cache_path)
         nums_of_tries = runner.play_all().values()
         mean_num_tries = sum(nums_of_tries) / len(nums_of_tries)
         assert mean_num_tries <= 3.74
         assert max(nums_of_tries) <= 10
 
-    def test_play_all_using_wordle_corpus(self, official_wordle_corpus):
+    def test_play_all_parallel(self, official_wordle_corpus, cache_path):
+        corpus = official_wordle_corpus[:100]
+        nums_of_tries = {}
+        for num_workers in [1, 2, 3]:
+            wordle = Wordle(corpus=corpus, seed=0)
+            solver = GreedyEntropySolver(corpus=corpus)
+            runner = Runner(corpus_name='test_parallel_corpus', wordle=wordle, solver=solver, cache_path=cache_path)
+            nums_of_tries[num_workers] = runner.play_all(num_workers=num_workers)
+        assert len(nums_of_tries[1]) >= len(corpus) - 1
+        assert list(nums_of_tries[1].items()) == list(nums_of_tries[2].items())
+        assert list(nums_of_tries[1].items()) == list(nums_of_tries[3].items())
+
+    def test_play_all_using_wordle_corpus(self, official_wordle_corpus, cache_path):
         wordle = Wordle(corpus=official_wordle_corpus)
-        runner = Runner(wordle=wordle, seed=0)
+        runner = Runner(wordle=wordle, seed=0, cache_path=cache_path)
         nums_of_tries = runner.play_all().values()
         mean_num_tries = sum(nums_of_tries) / len(nums_of_tries)
         assert mean_num_tries <= 3.8
-        assert max(nums_of_tries) <= 9
+        # raise then taper leave water among 8 words that only differ in the first letter, guessing from
+        # the pool each guess only rules itself out, so the last of them in corpus order takes 2 + 8
+        assert max(nums_of_tries) <= 10
+
+    def test_play_all_lookahead_using_wordle_corpus(self, official_wordle_corpus, cache_path):
+        wordle = Wordle(corpus=official_wordle_corpus)
+        runner = Runner(wordle=wordle, solver=LookaheadSolver(), seed=0, cache_path=cache_path)
+        nums_of_tries = runner.play_all().values()
+        mean_num_tries = sum(nums_of_tries) / len(nums_of_tries)
+        assert mean_num_tries <= 3.72
+        assert max(nums_of_tries) <= 12
+
+    def test_play_all_allowed_guesses_using_wordle_corpus(self, official_wordle_corpus, cache_path):
+        wordle = Wordle(corpus=official_wordle_corpus)
+        solver = GreedyEntropySolver(corpus=official_wordle_corpus, guesses=Solver.allowed_guesses())
+        runner = Runner(corpus_name='wordle_allowed_guesses', wordle=wordle, solver=solver, seed=0,
+                        cache_path=cache_path)
+        nums_of_tries = runner.play_all().values()
+        mean_num_tries = sum(nums_of_tries) / len(nums_of_tries)
+        assert mean_num_tries <= 3.5
+        assert max(nums_of_tries) <= 6
+
+    def test_play_stream_resumes(self, official_wordle_corpus, tmp_path, cache_path):
+        corpus = official_wordle_corpus[:60]
+        results_path = str(tmp_path / 'results.jsonl')
+
+        def new_runner():
+            return Runner(corpus_name='test_stream_corpus', wordle=Wordle(corpus=corpus, seed=0),
+                          solver=GreedyEntropySolver(corpus=corpus), cache_path=cache_path)
+        stream = new_runner().play_stream(results_path)
+        first = [next(stream) for _ in range(20)]
+        stream.close()
+        with open(results_path, 'a') as f:
+            f.write('{"target": "half wri')  # crash mid write
+        stats = new_runner().evaluate(results_path, num_workers=2)
+        with open(results_path, 'r') as f:
+            lines = f.readlines()
+        records = [json.loads(line) for line in lines[1:]]
+        assert records[:20] == first
+        assert sorted(r['target'] for r in records) == sorted(corpus)
+        assert stats.count == len(corpus)
+        assert stats.mean == pytest.approx(sum(r['num_guesses'] for r in records) / len(corpus))
+        assert all(len(r['turns']) == r['num_guesses'] and r['turns'][-1][1] == '22222' for r in records)
+
+        played = {}
+        for num_workers in [1, 3]:
+            path = str(tmp_path / f'all_{num_workers}.jsonl')
+            played[num_workers] = [(r['target'], r['num_guesses'])
+                                   for r in new_runner().play_stream(path, num_workers=num_workers)]
+        assert played[1] == played[3]
+        assert played[1] == [(r['target'], r['num_guesses']) for r in records]
+
+
+class TestMultiRunner:
+    def test_play_all(self, official_wordle_corpus):
+        for num_boards, max_tries in [(4, 11), (8, 16)]:
+            runner = MultiRunner(num_boards, MultiWordle(num_boards, official_wordle_corpus, seed=0),
+                                 MultiBoardSolver(official_wordle_corpus, num_boards=num_boards))
+            stats = runner.play_all(20)
+            assert stats.count == 20
+            assert stats.max <= max_tries
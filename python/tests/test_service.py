@@ -0,0 +1,70 @@
+import asyncio
+import json
+import pytest
+from ..wordle_solver.service import Engine, SolverService
+from ..wordle_solver.solvers import GreedyEntropySolver
+from ..wordle_solver.wordle import Wordle
+
+
+async def play(service, target):
+    session_id = service.new_game()
+    num_guesses = 0
+    while True:
+        guess = await service.suggest(session_id)
+        num_guesses += 1
+        if guess == target:
+            service.end_game(session_id)
+            return num_guesses
+        await service.feedback(session_id, guess, Wordle.score(guess, target))
+
+
+class TestSolverService:
+    def test_concurrent_games_match_greedy_solver(self, official_wordle_corpus):
+        corpus = official_wordle_corpus[:300]
+        solver = GreedyEntropySolver(corpus=corpus)
+        service = SolverService(Engine(solver))
+
+        async def play_all():
+            return await asyncio.gather(*[play(service, target) for target in corpus])
+
+        nums_of_tries = asyncio.run(play_all())
+        assert not service.sessions
+        for target, num_tries in zip(corpus[:30], nums_of_tries):
+            solver.reset()
+            guess, num_guesses = solver.get_best_guess()[0], 1
+            while guess != target:
+                solver.update_pool(guess, Wordle.score(guess, target))
+                guess, num_guesses = solver.get_best_guess()[0], num_guesses + 1
+            assert num_tries == num_guesses
+
+    def test_unknown_session(self, official_wordle_corpus):
+        corpus = official_wordle_corpus[:300]
+        service = SolverService(Engine(GreedyEntropySolver(corpus=corpus)))
+        with pytest.raises(KeyError):
+            asyncio.run(service.suggest(0))
+
+    def test_serve_stream(self, official_wordle_corpus):
+        corpus = official_wordle_corpus[:300]
+        service = SolverService(Engine(GreedyEntropySolver(corpus=corpus)))
+
+        async def client():
+            server = await asyncio.start_server(service.serve_stream, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            responses = []
+            for request in [{'op': 'new'}, {'op': 'suggest', 'session': 0},
+                            {'op': 'feedback', 'session': 0, 'guess': 'aback', 'outcome': [2, 2, 2, 2, 0]},
+                            {'op': 'suggest', 'session': 1}, {'op': 'end', 'session': 0}]:
+                writer.write((json.dumps(request) + '\n').encode())
+                responses += [json.loads(await reader.readline())]
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return responses
+
+        responses = asyncio.run(client())
+        assert responses[0] == {'session': 0}
+        assert responses[1]['guess'] in corpus
+        assert responses[2] == {'remaining': 0}
+        assert 'error' in responses[3]
+        assert responses[4] == {}
@@ -0,0 +1,53 @@
+import pytest
+from ..wordle_solver.runners import Runner
+from ..wordle_solver.simulate import BatchSimulator
+from ..wordle_solver.solvers import GreedyEntropySolver, LookaheadSolver, Solver
+from ..wordle_solver.wordle import Wordle
+
+
+class TestBatchSimulator:
+    def replay(self, solver, corpus, cache_path):
+        runner = Runner(corpus_name='test_simulate_corpus', wordle=Wordle(corpus=corpus), solver=solver,
+                        debug_log=False, cache_path=cache_path)
+        nums_of_tries = {}
+        for target in corpus:
+            runner.play(target=target)
+            nums_of_tries[target] = runner.wordle.num_guesses
+        return nums_of_tries
+
+    def test_matches_replay(self, official_wordle_corpus, cache_path):
+        corpus = official_wordle_corpus[:300]
+        for solver_cls in [GreedyEntropySolver, LookaheadSolver]:
+            solver = solver_cls(corpus=corpus)
+            expected = self.replay(solver_cls(corpus=corpus), corpus, cache_path)
+            assert BatchSimulator(solver).run(corpus) == expected
+            assert list(solver.pool_indices) == list(range(len(corpus)))
+
+    def test_matches_replay_with_guesses(self, official_wordle_corpus, cache_path):
+        corpus = official_wordle_corpus[:300]
+        guesses = Solver.default_corpus()[:2000]
+        solver = GreedyEntropySolver(corpus=corpus, guesses=guesses)
+        targets = corpus[::3]
+        expected = self.replay(GreedyEntropySolver(corpus=corpus, guesses=guesses), corpus,
+                               cache_path)
+        assert BatchSimulator(solver).run(targets) == {t: expected[t] for t in targets}
+
+    def test_opening_and_unknown_targets(self, official_wordle_corpus):
+        corpus = official_wordle_corpus[:300]
+        solver = GreedyEntropySolver(corpus=corpus)
+        nums_of_tries = BatchSimulator(solver).run(corpus[:20], opening=corpus[5])
+        assert nums_of_tries[corpus[5]] == 1
+        assert min(n for t, n in nums_of_tries.items() if t != corpus[5]) >= 2
+        with pytest.raises(ValueError):
+            BatchSimulator(solver).run(['zzzzz'])
+
+    def test_play_all_batched(self, official_wordle_corpus, cache_path):
+        corpus = official_wordle_corpus[:300]
+        runner = Runner(corpus_name='test_simulate_corpus', wordle=Wordle(corpus=corpus, seed=0),
+                        solver=GreedyEntropySolver(corpus=corpus), debug_log=False, cache_path=cache_path)
+        batched = runner.play_all_batched()
+        assert sorted(batched) == sorted(corpus)
+        runner.wordle = Wordle(corpus=corpus, seed=0)
+        serial = runner.play_all()
+        assert len(serial) >= len(corpus) - 1
+        assert all(batched[t] == n for t, n in serial.items())
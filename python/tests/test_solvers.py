@@ -1,5 +1,7 @@
-from ..wordle_solver.solvers import GreedyEntropySolver
+import pytest
+from ..wordle_solver.solvers import GreedyEntropySolver, LookaheadSolver, MultiBoardSolver, Solver
 from ..wordle_solver.solvers import EntropySolver
+from ..wordle_solver.wordle import MultiWordle, Wordle
 from .conftest import tol
 
 
@@ -65,3 +67,174 @@ class TestGreedyEntropySolver:
         assert len(more_than_one) == 0, f'words with probs > 1: {more_than_one}'
         assert len(less_than_one) == 0, f'words with probs < 1: {less_than_one}'
         assert len(words_with_bad_entropies) == 0, 'words with out of bound entropies'
+
+
+class TestGreedyEntropySolverWithGuesses:
+    corpus = ['bills', 'fills', 'hills', 'kills', 'mills', 'pills']
+    solver = GreedyEntropySolver(corpus=corpus, guesses=['bfhkm', 'zzzzz'])
+
+    def test_guesses_include_corpus(self):
+        assert self.solver.guesses == ['bfhkm', 'zzzzz'] + self.corpus
+        assert self.solver.config != GreedyEntropySolver(corpus=self.corpus).config
+
+    def test_get_best_guess_outside_pool(self):
+        self.solver.reset()
+        best_guess, entropies = self.solver.get_best_guess()
+        assert best_guess == 'bfhkm'
+        assert len(entropies) == len(self.solver.pool)
+        assert abs(entropies['bfhkm'] - EntropySolver.calc_entropy([1 / 6] * 6)) < tol
+
+    def test_prefers_pool_on_ties(self):
+        self.solver.reset()
+        self.solver.update_pool('bfhkm', [0, 0, 0, 0, 0])
+        assert self.solver.pool == ['pills']
+        assert self.solver.get_best_guess()[0] == 'pills'
+        self.solver.pool = ['bills', 'fills']
+        assert self.solver.get_best_guess()[0] == 'bills'
+
+
+class TestLookaheadSolver:
+    solver = LookaheadSolver(corpus=GreedyEntropySolver.default_corpus()[:1000])
+
+    def test_lower_bound(self):
+        assert LookaheadSolver.lower_bound(1) == 1
+        assert LookaheadSolver.lower_bound(2) == 1.5
+        assert self.solver.estimate(100) >= LookaheadSolver.lower_bound(100)
+
+    def test_get_best_guess(self):
+        self.solver.pool = ['aaaaa', 'abbbb', 'aaccc', 'aaadd', 'aaaae', 'fffff']
+        best_guess, entropies = self.solver.get_best_guess()
+        assert best_guess in ['aaaaa', 'aaaae']
+        assert len(entropies) == len(self.solver.pool)
+
+    def test_expected_guesses_not_worse_than_greedy(self):
+        self.solver.reset()
+        expected, best_guess = self.solver.expected_guesses(self.solver.pool_indices, depth=1)
+        greedy_guess, _ = GreedyEntropySolver.get_best_guess(self.solver)
+        self.solver.memo.clear()
+        greedy_expected = 1 + sum(
+            len(p) * self.solver.estimate(len(p))
+            for p in self.solver.partitions(self.solver.patterns.guess_index[greedy_guess], self.solver.pool_indices)
+        ) / len(self.solver.pool_indices)
+        assert best_guess in self.solver.pool
+        assert expected <= greedy_expected
+
+    def test_keeps_pool_words_among_tied_candidates(self):
+        with open('./data/wordle_possible_answers.txt', 'r') as f:
+            corpus = [line.strip() for line in f.readlines()]
+        solver = LookaheadSolver(corpus=corpus, guesses=Solver.allowed_guesses())
+        # left after soare, every word splits it into singletons, allowed guesses like aalii come first
+        solver.pool = ['arise', 'parse', 'raise']
+        best_guess, _ = solver.get_best_guess()
+        assert best_guess in ['arise', 'parse', 'raise']
+        assert solver.expected_guesses(solver.pool_indices, solver.depth)[0] == pytest.approx(5 / 3)
+
+    def test_memo_follows_the_matrix(self):
+        corpus = ['first', 'fight', 'light', 'might', 'night', 'sight', 'tight', 'right']
+        solver = LookaheadSolver(corpus=corpus)
+        solver.pool = ['aaaaa', 'abbbb', 'aaccc', 'aaadd', 'aaaae', 'fffff']  # not in the corpus
+        solver.get_best_guess()
+        solver.pool = corpus[:6]
+        best_guess, _ = solver.get_best_guess()
+        fresh_solver = LookaheadSolver(corpus=corpus)
+        fresh_solver.pool = corpus[:6]
+        assert best_guess in corpus[:6]
+        assert best_guess == fresh_solver.get_best_guess()[0]
+
+
+class TestOtherVariants:
+    def test_nerdle_equations(self):
+        equations = [f'{a}{op}{b}={c}' for a in range(100) for b in range(100)
+                     for op, c in [('+', a + b), ('-', a - b), ('*', a * b)] if c >= 0]
+        equations = list(dict.fromkeys(e for e in equations if len(e) == 8))
+        solver = GreedyEntropySolver(corpus=equations)
+        target = equations[123]
+        for _ in range(6):
+            guess, _ = solver.get_best_guess()
+            if guess == target:
+                break
+            solver.update_pool(guess, Wordle.score(guess, target))
+        assert guess == target
+
+    def test_word_lengths(self):
+        for word_len in [4, 6, 8]:
+            corpus = GreedyEntropySolver.default_corpus(word_len)[:300]
+            assert {len(w) for w in corpus} == {word_len}
+            solver = GreedyEntropySolver(corpus=corpus)
+            assert solver._outcomes is None
+            target = corpus[-1]
+            wordle = Wordle(corpus=corpus)
+            wordle.new_game(target=target)
+            solved = False
+            while not solved:
+                guess, _ = solver.get_best_guess()
+                solved, outcome = wordle.guess(guess)
+                solver.update_pool(guess, outcome)
+            assert wordle.num_guesses <= 8
+            assert solver._outcomes is None
+
+
+class TestMultiBoardSolver:
+    corpus = GreedyEntropySolver.default_corpus()[:500]
+
+    def test_first_guess_matches_single_board(self):
+        solver = MultiBoardSolver(corpus=self.corpus, num_boards=4)
+        best_guess, entropies = solver.get_best_guess()
+        single_guess, single_entropies = GreedyEntropySolver(corpus=self.corpus).get_best_guess()
+        assert best_guess == single_guess
+        assert abs(entropies[best_guess] - 4 * single_entropies[single_guess]) < 1e-9
+        assert solver.config != MultiBoardSolver(corpus=self.corpus, num_boards=8).config
+
+    def test_solves_every_board(self):
+        solver = MultiBoardSolver(corpus=self.corpus, num_boards=4)
+        wordle = MultiWordle(num_boards=4, corpus=self.corpus, seed=1)
+        targets = wordle.new_game()
+        all_solved = False
+        while not all_solved:
+            guess, _ = solver.get_best_guess()
+            all_solved, outcomes = wordle.guess(guess)
+            solver.update_pool(guess, outcomes)
+            for board, target in enumerate(targets):
+                assert solver.solved[board] or target in [self.corpus[i] for i in solver.pools[board]]
+        assert all(solver.solved)
+        assert wordle.num_guesses <= 12
+
+    def test_plays_single_words_left_on_a_board(self):
+        solver = MultiBoardSolver(corpus=self.corpus, num_boards=2)
+        solver.pools = [solver.pool_indices[:1], solver.pool_indices[100:200]]
+        assert solver.get_best_guess()[0] == self.corpus[0]
+
+
+class TestGreedyEntropySolverWithPriors:
+    corpus = ['bills', 'fills', 'hills', 'kills', 'mills', 'pills', 'zills']
+
+    def test_weighted_entropy(self):
+        priors = [4., 1., 1., 1., 1., 1., 1.]
+        solver = GreedyEntropySolver(corpus=self.corpus, priors=priors)
+        entropy, probabilities = solver.get_entropy('bfhkm')
+        assert sorted(probabilities) == pytest.approx([0.1] * 4 + [0.2, 0.4])  # pills and zills tie
+        assert abs(entropy - EntropySolver.calc_entropy([0.1] * 4 + [0.2, 0.4])) < tol
+        entropy, probabilities = solver.get_entropy('bills')
+        assert sorted(probabilities) == pytest.approx([0.4, 0.6])
+        assert abs(solver.get_entropies(['bills'])[0] - entropy) < tol
+        assert solver.config != GreedyEntropySolver(corpus=self.corpus).config
+
+    def test_uniform_priors_match_unweighted(self):
+        corpus = GreedyEntropySolver.default_corpus()[:300]
+        uniform = GreedyEntropySolver(corpus=corpus)
+        weighted = GreedyEntropySolver(corpus=corpus, priors=[.5] * len(corpus))
+        for pool in [corpus, corpus[:40]]:
+            uniform.pool, weighted.pool = pool, pool
+            assert abs(weighted.get_entropies() - uniform.get_entropies()).max() < 1e-9
+        uniform.update_pool(corpus[0], Wordle.score(corpus[0], corpus[1]))
+        weighted.update_pool(corpus[0], Wordle.score(corpus[0], corpus[1]))
+        assert abs(weighted.get_entropies() - uniform.get_entropies()).max() < 1e-9
+
+    def test_prefers_likely_answers(self):
+        solver = GreedyEntropySolver(corpus=self.corpus, priors=[1., 1., 1., 1., 1., 1., 50.])
+        solver.pool = ['mills', 'zills']
+        assert solver.get_best_guess()[0] == 'zills'
+        solver.pool = ['zills', 'mills']
+        assert solver.get_best_guess()[0] == 'zills'
+        with pytest.raises(ValueError):
+            GreedyEntropySolver(corpus=self.corpus, priors=[1.])
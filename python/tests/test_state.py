@@ -0,0 +1,51 @@
+import random
+import numpy as np
+from ..wordle_solver.patterns import PatternMatrix, get_pattern_matrix
+from ..wordle_solver.solvers import GreedyEntropySolver, Solver
+from ..wordle_solver.state import PoolState
+from ..wordle_solver.wordle import Wordle
+
+
+class TestPoolState:
+    def narrow_and_compare(self, patterns, candidates, guesses, target):
+        state = PoolState(patterns, np.arange(len(patterns.answers)), candidates)
+        expected_pool = patterns.answers
+        for guess in guesses:
+            state.narrow(guess, Wordle.score(guess, target))
+            expected_pool = [w for w in expected_pool if Wordle.score(guess, w) == Wordle.score(guess, target)]
+            assert [patterns.answers[i] for i in state.pool_indices] == expected_pool
+            assert np.array_equal(state.block, patterns.matrix[np.ix_(state.candidates, state.pool_indices)])
+            assert np.allclose(state.entropies(), patterns.entropies(state.candidates, state.pool_indices))
+        return state
+
+    def test_narrow_pool_only(self):
+        corpus = Solver.default_corpus()[:500]
+        state = self.narrow_and_compare(get_pattern_matrix(corpus), None, [corpus[0], corpus[7]], corpus[123])
+        assert np.array_equal(state.candidates, state.pool_indices)
+
+    def test_narrow_with_guesses_drops_redundant_candidates(self):
+        corpus = Solver.default_corpus()
+        random.seed(0)
+        answers, guesses = random.sample(corpus, 300), random.sample(corpus, 600)
+        patterns = PatternMatrix(guesses, answers)
+        state = self.narrow_and_compare(patterns, np.arange(len(guesses)), [guesses[0], guesses[1]], answers[0])
+        assert len(state.candidates) < len(guesses)
+        # every dropped candidate either splits nothing or splits the pool like a kept one
+        kept_rows = {patterns.matrix[i, state.pool_indices].tobytes() for i in state.candidates}
+        for i in np.setdiff1d(np.arange(len(guesses)), state.candidates):
+            row = patterns.matrix[i, state.pool_indices]
+            assert len(set(row)) == 1 or row.tobytes() in kept_rows
+
+    def test_solver_matches_rescoring(self):
+        corpus = Solver.default_corpus()[:800]
+        solver = GreedyEntropySolver(corpus=corpus, guesses=Solver.default_corpus()[800:1600])
+        target = corpus[42]
+        for _ in range(3):
+            best_guess, _ = solver.get_best_guess()
+            pool_indices = solver.pool_indices
+            best_index, _, _ = solver.best_guess_for(pool_indices)
+            assert best_guess == solver.patterns.guesses[best_index]
+            if best_guess == target:
+                break
+            solver.update_pool(best_guess, Wordle.score(best_guess, target))
+            assert target in solver.pool
@@ -1,4 +1,4 @@
-from ..wordle_solver.wordle import Wordle
+from ..wordle_solver.wordle import MultiWordle, Wordle
 
 
 class TestWordle:
@@ -57,3 +57,18 @@ class TestWordle:
         self.wordle.curr_word = 'abcde'
         assert self.wordle.guess('abcde') == (True, [2, 2, 2, 2, 2])
         assert self.wordle.curr_word is None
+
+
+class TestMultiWordle:
+    def test_boards_drop_out_when_solved(self):
+        wordle = MultiWordle(num_boards=3, corpus=['aaaaa', 'bbbbb', 'ccccc', 'abcde'], seed=0)
+        assert len(set(wordle.new_game())) == 3
+        wordle.new_game(['aaaaa', 'bbbbb', 'abcde'])
+        all_solved, outcomes = wordle.guess('aaaaa')
+        assert not all_solved
+        assert outcomes == [[2] * 5, [0] * 5, [2, 0, 0, 0, 0]]
+        all_solved, outcomes = wordle.guess('abcde')
+        assert outcomes[0] is None and outcomes[2] == [2] * 5
+        all_solved, outcomes = wordle.guess('bbbbb')
+        assert all_solved and outcomes == [None, [2] * 5, None]
+        assert wordle.num_guesses == 3
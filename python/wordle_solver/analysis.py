@@ -0,0 +1,176 @@
+import argparse
+import sys
+import numpy as np
+from .metrics import metrics
+from .solvers import GreedyEntropySolver, LookaheadSolver, Solver
+
+
+class WorstCaseAnalysis:
+    # worst-case number of guesses over every target, either under the solver's own policy or under
+    # the best play the adversary can't beat (minimax over feedback partitions), both memoized on the
+    # canonical (sorted) pool so different histories reaching the same pool are searched once
+    def __init__(self, solver, top_k=10):
+        self.solver = solver
+        self.patterns = solver.patterns
+        self.top_k = top_k  # minimax candidates per pool, best entropies first, None for all of them
+        self.all_correct = self.patterns.num_patterns - 1
+        self.policy_memo = {}  # pool -> (worst, worst target ids)
+        self.minimax_memo = {}  # pool -> (value, exact, guess id), value is a lower bound when not exact
+
+    @staticmethod
+    def key(pool_indices):
+        return np.sort(pool_indices).tobytes()
+
+    def partitions(self, guess_index, pool_indices):
+        # pools left after guess_index for every feedback but all correct
+        row = self.patterns.matrix[guess_index, pool_indices]
+        return [pool_indices[row == code] for code in np.unique(row) if code != self.all_correct]
+
+    def is_answer(self, guess_index, pool_indices):
+        return self.patterns.answer_of_guess[guess_index] in pool_indices
+
+    def guess_index(self, guess):
+        if guess not in self.patterns.guess_index:
+            raise ValueError(f'{guess} is not one of the solver\'s guesses')
+        return self.patterns.guess_index[guess]
+
+    def policy_worst_case(self, opening=None):
+        # -> (worst number of guesses, targets that take that many) under the solver's policy
+        initial_pool_indices = self.solver.pool_indices
+        try:
+            guess_index = None if opening is None else self.guess_index(opening)
+            worst, targets = self.policy(initial_pool_indices, guess_index)
+        finally:
+            self.solver.restrict_pool(initial_pool_indices)
+        return worst, [self.patterns.answers[i] for i in sorted(targets)]
+
+    def policy(self, pool_indices, guess_index=None):
+        key = WorstCaseAnalysis.key(pool_indices)
+        if guess_index is None and key in self.policy_memo:
+            return self.policy_memo[key]
+        metrics.inc('worst_case_states', mode='policy')
+        opening = guess_index is not None
+        if not opening:
+            self.solver.restrict_pool(pool_indices)
+            guess, _ = self.solver.get_best_guess()
+            guess_index = self.patterns.guess_index[guess]
+        worst, targets = 0, []
+        if self.is_answer(guess_index, pool_indices):
+            worst, targets = 1, [self.patterns.answer_of_guess[guess_index]]
+        for partition in self.partitions(guess_index, pool_indices):
+            partition_worst, partition_targets = self.policy(partition)
+            if 1 + partition_worst > worst:
+                worst, targets = 1 + partition_worst, list(partition_targets)
+            elif 1 + partition_worst == worst:
+                targets += partition_targets
+        if not opening:
+            self.policy_memo[key] = worst, targets
+        return worst, targets
+
+    def minimax_worst_case(self, opening=None, depth_limit=6):
+        # -> (fewest guesses that solve every target whatever the feedback, or None past depth_limit,
+        # targets that take that many when playing the minimax guesses)
+        pool_indices = self.solver.pool_indices
+        if len(pool_indices) <= 2:
+            return len(pool_indices), [self.patterns.answers[i] for i in pool_indices[-1:]]
+        if opening is None:
+            value = self.minimax(pool_indices, depth_limit)
+            guess_index = self.minimax_memo[WorstCaseAnalysis.key(pool_indices)][2]
+        else:
+            guess_index = self.guess_index(opening)
+            value = self.value_of(guess_index, pool_indices, depth_limit)
+        if value > depth_limit:
+            return None, []
+        _, targets = self.deepest_targets(pool_indices, guess_index)
+        return value, [self.patterns.answers[i] for i in sorted(targets)]
+
+    def candidates(self, pool_indices):
+        # any word the matrix can score, not only the pool like the pool-only policy: a family like
+        # fight/light/might/... takes one guess per word when only the pool may be guessed; best
+        # entropies first, words that could be the answer first among equals
+        candidates = np.arange(len(self.patterns.guesses))
+        entropies = self.patterns.entropies(candidates, pool_indices)
+        in_pool = np.isin(self.patterns.answer_of_guess, pool_indices)
+        order = np.lexsort((~in_pool, -entropies))
+        return candidates[order if self.top_k is None else order[:self.top_k]]
+
+    def value_of(self, guess_index, pool_indices, limit):
+        # guesses needed after playing guess_index, limit + 1 as soon as it's known to be more than limit
+        value = 1
+        partitions = sorted(self.partitions(guess_index, pool_indices), key=len, reverse=True)
+        if len(partitions) == 1 and len(partitions[0]) == len(pool_indices):
+            return limit + 1  # learns nothing
+        for partition in partitions:
+            if limit < 2:
+                return limit + 1
+            value = max(value, 1 + self.minimax(partition, limit - 1))
+            if value > limit:
+                return limit + 1
+        return value
+
+    def minimax(self, pool_indices, limit):
+        # fewest guesses that solve every target in pool_indices, limit + 1 if that's more than limit
+        pool_len = len(pool_indices)
+        if pool_len <= 2:
+            return min(pool_len, limit + 1)
+        key = WorstCaseAnalysis.key(pool_indices)
+        if key in self.minimax_memo:
+            value, exact, _ = self.minimax_memo[key]
+            if exact or value > limit:
+                return min(value, limit + 1)
+        metrics.inc('worst_case_states', mode='minimax')
+        best, best_guess = limit + 1, None
+        for guess_index in self.candidates(pool_indices):
+            # only look for something strictly better than the best so far
+            value = self.value_of(guess_index, pool_indices, best - 1)
+            if value < best:
+                best, best_guess = value, guess_index
+                if best <= 2:  # more than one word left always takes two
+                    break
+        self.minimax_memo[key] = best, best <= limit, best_guess
+        return best
+
+    def deepest_targets(self, pool_indices, guess_index):
+        # targets taking the most guesses when every later pool plays its memoized minimax guess
+        worst, targets = 0, []
+        if self.is_answer(guess_index, pool_indices):
+            worst, targets = 1, [self.patterns.answer_of_guess[guess_index]]
+        for partition in self.partitions(guess_index, pool_indices):
+            if len(partition) <= 2:
+                partition_worst, partition_targets = len(partition), list(partition[-1:])
+            else:
+                next_guess = self.minimax_memo[WorstCaseAnalysis.key(partition)][2]
+                partition_worst, partition_targets = self.deepest_targets(partition, next_guess)
+            if 1 + partition_worst > worst:
+                worst, targets = 1 + partition_worst, list(partition_targets)
+            elif 1 + partition_worst == worst:
+                targets += partition_targets
+        return worst, targets
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='worst-case number of guesses of a solver or of minimax play')
+    parser.add_argument('--corpus', default='./data/wordle_possible_answers.txt', help='answers, one per line')
+    parser.add_argument('--allowed-guesses', action='store_true', help='guess from all allowed words, not only the pool')
+    parser.add_argument('--solver', choices=['greedy', 'lookahead'], default='greedy')
+    parser.add_argument('--opening', help="first guess, the policy's own by default")
+    parser.add_argument('--mode', choices=['policy', 'minimax'], default='policy')
+    parser.add_argument('--depth-limit', type=int, default=6, help='exit 1 when the worst case takes more guesses')
+    parser.add_argument('--top-k', type=int, default=10, help='minimax candidates per pool')
+    args = parser.parse_args()
+    with open(args.corpus, 'r') as f:
+        corpus = [line.strip() for line in f.readlines()]
+    guesses = Solver.allowed_guesses() if args.allowed_guesses else None
+    solver = (LookaheadSolver if args.solver == 'lookahead' else GreedyEntropySolver)(corpus=corpus, guesses=guesses)
+    analysis = WorstCaseAnalysis(solver, args.top_k)
+    if args.mode == 'policy':
+        worst, targets = analysis.policy_worst_case(args.opening)
+        print(f'{solver.config} worst case {worst} guesses, {len(analysis.policy_memo)} distinct pools')
+    else:
+        worst, targets = analysis.minimax_worst_case(args.opening, args.depth_limit)
+        if worst is None:
+            print(f'no play found within {args.depth_limit} guesses (top {args.top_k} candidates per pool)')
+        else:
+            print(f'minimax worst case {worst} guesses, {len(analysis.minimax_memo)} distinct pools')
+    print('worst targets', targets)
+    sys.exit(0 if worst is not None and worst <= args.depth_limit else 1)
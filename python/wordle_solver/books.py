@@ -0,0 +1,86 @@
+import hashlib
+from collections import deque
+import numpy as np
+from .patterns import PatternMatrix
+
+
+class OpeningBook:
+    # the whole policy tree, flattened: node i plays guess_words[node_guess[i]] and the
+    # feedback pattern p leads to node edges[i * num_patterns + p], node 0 is the opening
+    def __init__(self, answers, guess_words, node_guess, node_entropy, edge_keys, edge_children,
+                 word_len, solver_config):
+        self.answers = list(answers)
+        self.guess_words = list(guess_words)
+        self.node_guess = np.asarray(node_guess, dtype=np.int32)
+        self.node_entropy = np.asarray(node_entropy, dtype=np.float32)
+        self.edge_keys = np.asarray(edge_keys, dtype=np.int64)
+        self.edge_children = np.asarray(edge_children, dtype=np.int32)
+        self.word_len = word_len
+        self.num_patterns = 3 ** word_len
+        self.solver_config = solver_config
+        self.edges = dict(zip(self.edge_keys.tolist(), self.edge_children.tolist()))
+        # the policy the book plays, books built with another opening or from other solvers differ in it
+        content = hashlib.sha256('\n'.join(self.guess_words).encode())
+        for array in [self.node_guess, self.edge_keys, self.edge_children]:
+            content.update(array.tobytes())
+        self.hash = content.hexdigest()[:16]
+
+    def __len__(self):
+        return len(self.node_guess)
+
+    def guess(self, node):
+        return self.guess_words[self.node_guess[node]], float(self.node_entropy[node])
+
+    def child(self, node, outcome):
+        return self.edges.get(node * self.num_patterns + PatternMatrix.pattern_code(outcome))
+
+    @staticmethod
+    def build(solver, opening=None):
+        # breadth first walk over every reachable feedback pattern under solver's policy,
+        # node ids are handed out when a child is queued so the queue runs in id order
+        patterns = solver.patterns
+        all_correct = patterns.num_patterns - 1
+        initial_pool_indices = solver.pool_indices
+        guess_words, guess_ids = [], {}
+        node_guess, node_entropy, edge_keys, edge_children = [], [], [], []
+        queue = deque([(solver.pool_indices, opening)])
+        num_nodes = 1
+        while queue:
+            pool_indices, guess = queue.popleft()
+            node = len(node_guess)
+            solver.restrict_pool(pool_indices)
+            if guess is None:
+                guess, entropies = solver.get_best_guess()
+                entropy = entropies[guess]
+            else:
+                entropy, _ = solver.get_entropy(guess)
+            if guess not in guess_ids:
+                guess_ids[guess] = len(guess_words)
+                guess_words += [guess]
+            node_guess += [guess_ids[guess]]
+            node_entropy += [entropy]
+            row = solver.patterns.row(guess, solver.pool_indices)
+            for code in np.unique(row):
+                if code == all_correct:
+                    continue
+                edge_keys += [node * patterns.num_patterns + int(code)]
+                edge_children += [num_nodes]
+                num_nodes += 1
+                queue.append((solver.pool_indices[row == code], None))
+        solver.restrict_pool(initial_pool_indices)
+        return OpeningBook(patterns.answers, guess_words, node_guess, node_entropy, edge_keys, edge_children,
+                           patterns.word_len, solver.config)
+
+    def save(self, path):
+        np.savez_compressed(
+            path, answers=np.array(self.answers, dtype=bytes), guess_words=np.array(self.guess_words, dtype=bytes),
+            node_guess=self.node_guess, node_entropy=self.node_entropy, edge_keys=self.edge_keys,
+            edge_children=self.edge_children, word_len=self.word_len, solver_config=self.solver_config)
+
+    @staticmethod
+    def load(path):
+        with np.load(path) as book:
+            return OpeningBook(
+                [w.decode() for w in book['answers']], [w.decode() for w in book['guess_words']],
+                book['node_guess'], book['node_entropy'], book['edge_keys'], book['edge_children'],
+                int(book['word_len']), str(book['solver_config']))
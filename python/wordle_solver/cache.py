@@ -0,0 +1,84 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+
+
+class EntropyCache:
+    # one sqlite file shared by every runner and process, rows keyed by
+    # (corpus hash, solver config, guess history) so a changed corpus or solver never hits old rows
+    def __init__(self, path, corpus_name, corpus, solver_config):
+        self.path = path
+        self.corpus_name = corpus_name
+        self.corpus_hash = EntropyCache.hash_corpus(corpus)
+        self.solver_config = solver_config
+        self._connection = None
+        self._pid = None
+
+    def __getstate__(self):
+        # connections can't cross processes, each worker reopens its own
+        state = self.__dict__.copy()
+        state['_connection'], state['_pid'] = None, None
+        return state
+
+    @property
+    def connection(self):
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute('''
+                CREATE TABLE IF NOT EXISTS entropies (
+                    corpus_hash TEXT NOT NULL,
+                    solver_config TEXT NOT NULL,
+                    history TEXT NOT NULL,
+                    corpus_name TEXT NOT NULL,
+                    best_guess TEXT NOT NULL,
+                    entropies BLOB,
+                    PRIMARY KEY (corpus_hash, solver_config, history)
+                ) WITHOUT ROWID''')
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def hash_corpus(corpus):
+        # in order: ties are broken by corpus order, a reordered corpus can play other guesses
+        return hashlib.sha256('\n'.join(corpus).encode()).hexdigest()
+
+    @staticmethod
+    def history_key(history):
+        # [('raise', [0, 1, 0, 0, 2])] -> 'raise:01002'
+        return ','.join(f'{guess}:{"".join(str(o) for o in outcome)}' for guess, outcome in history)
+
+    def prune_stale(self):
+        # rows under this corpus name built from another corpus, only on request: rows are keyed by the corpus
+        # hash anyway, and processes sharing the cache may use different corpora under the same name
+        stale = self.connection.execute(
+            'DELETE FROM entropies WHERE corpus_name = ? AND corpus_hash != ?',
+            (self.corpus_name, self.corpus_hash)).rowcount
+        if stale:
+            print(f'corpus {self.corpus_name} changed, dropped {stale} stale cached entropies')
+
+    def get_best_guess(self, history):
+        row = self.connection.execute(
+            'SELECT best_guess FROM entropies WHERE corpus_hash = ? AND solver_config = ? AND history = ?',
+            (self.corpus_hash, self.solver_config, EntropyCache.history_key(history))).fetchone()
+        return row[0] if row else None
+
+    def get(self, history):
+        row = self.connection.execute(
+            'SELECT best_guess, entropies FROM entropies WHERE corpus_hash = ? AND solver_config = ? AND history = ?',
+            (self.corpus_hash, self.solver_config, EntropyCache.history_key(history))).fetchone()
+        if not row:
+            return None, None
+        return row[0], pickle.loads(row[1]) if row[1] is not None else None
+
+    def put(self, history, best_guess, entropies=None):
+        # first writer wins, concurrent writers computed the same thing anyway
+        self.connection.execute(
+            'INSERT OR IGNORE INTO entropies VALUES (?, ?, ?, ?, ?, ?)',
+            (self.corpus_hash, self.solver_config, EntropyCache.history_key(history), self.corpus_name,
+             best_guess, pickle.dumps(entropies) if entropies is not None else None))
+
+    def clear(self):
+        self.connection.execute('DELETE FROM entropies WHERE corpus_hash = ?', (self.corpus_hash,))
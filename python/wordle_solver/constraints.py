@@ -0,0 +1,62 @@
+from collections import Counter
+from functools import lru_cache
+import numpy as np
+from .patterns import PatternMatrix
+
+
+class ConstraintIndex:
+    # bitsets over word ids (python ints, bit i is words[i]) so a parsed outcome is a handful of ANDs:
+    # positions[p][letter] has the words with letter at p, at_least[letter][k] / exact[letter][k]
+    # the words with at least / exactly k copies of letter
+    def __init__(self, words):
+        self.words = list(words)
+        self.word_len = len(self.words[0]) if self.words else 0
+        self.all = (1 << len(self.words)) - 1
+        array = PatternMatrix.encode(self.words)
+        self.positions = []
+        for p in range(self.word_len):
+            column = array[:, p]
+            self.positions += [{chr(c): self.to_bits(column == c) for c in np.unique(column)}]
+        self.at_least, self.exact = {}, {}
+        for c in np.unique(array):
+            counts = (array == c).sum(axis=1)
+            self.at_least[chr(c)] = [self.to_bits(counts >= k) for k in range(self.word_len + 1)]
+            self.exact[chr(c)] = [self.to_bits(counts == k) for k in range(self.word_len + 1)]
+
+    def to_bits(self, mask):
+        return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+    def to_mask(self, bits):
+        num_bytes = (len(self.words) + 7) // 8
+        packed = np.frombuffer(bits.to_bytes(num_bytes, 'little'), dtype=np.uint8)
+        return np.unpackbits(packed, bitorder='little')[:len(self.words)].astype(bool)
+
+    def count_bits(self, letter, count, exact):
+        table = self.exact if exact else self.at_least
+        if letter not in table:
+            return self.all if count == 0 else 0
+        return table[letter][count] if count <= self.word_len else 0
+
+    def matches(self, correct, present, present_positions, not_present):
+        # same constraints as GreedyEntropySolver.parse_outcome describes: greens fixed, yellows banned
+        # from their position, a letter also seen grey has an exact count, otherwise a minimum count
+        bits = self.all
+        for p, letter in enumerate(correct):
+            if letter is not None:
+                bits &= self.positions[p].get(letter, 0)
+        for p, letter in enumerate(present_positions):
+            if letter is not None:
+                bits &= ~self.positions[p].get(letter, 0)
+        greens = Counter(letter for letter in correct if letter is not None)
+        for letter in set(present) | not_present:
+            bits &= self.count_bits(letter, greens[letter] + present[letter], exact=letter in not_present)
+        return self.to_mask(bits)
+
+
+@lru_cache(maxsize=8)
+def _cached_constraint_index(words):
+    return ConstraintIndex(words)
+
+
+def get_constraint_index(words):
+    return _cached_constraint_index(tuple(words))
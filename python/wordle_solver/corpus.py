@@ -0,0 +1,93 @@
+import hashlib
+import os
+import struct
+import numpy as np
+
+CORPUS_DIR = './corpora'
+MAGIC = b'WRDC'
+# magic, format version, word length, number of words, content sha256, source sha256
+HEADER = struct.Struct('<4sBBI32s32s')
+FORMAT_VERSION = 1
+
+_loaded = {}  # name -> Corpus, one per process
+
+
+class Corpus:
+    # fixed width word array (word_len bytes per word) with a hash of its contents, usually an mmap of
+    # a file built once, the python strings are decoded once per process and shared by every user
+    def __init__(self, array, content_hash=None):
+        self.array = array
+        self.word_len = array.shape[1] if array.ndim == 2 else 0
+        self.hash = content_hash if content_hash else hashlib.sha256(array.tobytes()).hexdigest()
+        self._words = None
+
+    def __len__(self):
+        return self.array.shape[0]
+
+    @property
+    def words(self):
+        if self._words is None:
+            text = self.array.tobytes().decode('ascii')
+            self._words = [text[i:i + self.word_len] for i in range(0, len(text), self.word_len)]
+        return self._words
+
+    @staticmethod
+    def from_words(words):
+        words = list(words)
+        if len({len(w) for w in words}) > 1:
+            raise ValueError('corpus words need the same length')
+        array = np.frombuffer(''.join(words).encode('ascii'), dtype=np.uint8)
+        return Corpus(array.reshape(len(words), -1) if words else array.reshape(0, 0))
+
+    def save(self, path, source_hash):
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, self.word_len, len(self), bytes.fromhex(self.hash),
+                             bytes.fromhex(source_hash))
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(self.array.tobytes())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path, source_hash=None):
+        # None if the file is missing, from another format version or built from other sources
+        try:
+            with open(path, 'rb') as f:
+                magic, version, word_len, num_words, content_hash, file_source_hash = \
+                    HEADER.unpack(f.read(HEADER.size))
+        except (FileNotFoundError, struct.error):
+            return None
+        if magic != MAGIC or version != FORMAT_VERSION:
+            return None
+        if source_hash is not None and file_source_hash.hex() != source_hash:
+            return None
+        if num_words == 0:
+            return Corpus(np.zeros((0, 0), dtype=np.uint8), content_hash.hex())
+        array = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER.size, shape=(num_words, word_len))
+        return Corpus(array, content_hash.hex())
+
+
+def source_hash(*sources):
+    # fingerprint of whatever a corpus is built from: file sizes and mtimes, package versions...
+    return hashlib.sha256(repr(sources).encode()).hexdigest()
+
+
+def file_source(path):
+    stat = os.stat(path)
+    return path, stat.st_size, stat.st_mtime_ns
+
+
+def load_corpus(name, build, get_sources=tuple):
+    # build() returns the word list, it only runs when no up to date binary corpus exists,
+    # get_sources() fingerprints what it's built from and only runs once per process
+    if name in _loaded:
+        return _loaded[name]
+    sources_hash = source_hash(*get_sources())
+    path = os.path.join(CORPUS_DIR, f'{name}.bin')
+    corpus = Corpus.load(path, sources_hash)
+    if corpus is None:
+        os.makedirs(CORPUS_DIR, exist_ok=True)
+        Corpus.from_words(build()).save(path, sources_hash)
+        corpus = Corpus.load(path, sources_hash)
+    _loaded[name] = corpus
+    return corpus
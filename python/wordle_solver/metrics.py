@@ -0,0 +1,122 @@
+import contextlib
+import os
+import threading
+import time
+from collections import defaultdict
+
+_NULL_TIMER = contextlib.nullcontext()
+
+
+class Timer:
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.observe(self.name, time.perf_counter() - self.start, **self.labels)
+
+
+class Registry:
+    # in-memory counters and summaries (count, sum, max) keyed by (name, labels), off by default so the
+    # hot paths pay one attribute check, worker processes keep their own copy
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.counters = defaultdict(float)
+        self.summaries = {}
+        self.exporters = []
+        self.lock = threading.Lock()  # the service scores on executor threads
+
+    @staticmethod
+    def key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[Registry.key(name, labels)] += value
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        key = Registry.key(name, labels)
+        with self.lock:
+            count, total, largest = self.summaries.get(key, (0, 0., value))
+            self.summaries[key] = count + 1, total + value, max(largest, value)
+
+    def timer(self, name, **labels):
+        if not self.enabled:
+            return _NULL_TIMER
+        return Timer(self, name, labels)
+
+    def snapshot(self):
+        with self.lock:
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in sorted(self.counters.items())]
+            summaries = [{'name': name, 'labels': dict(labels), 'count': count, 'sum': total, 'max': largest}
+                         for (name, labels), (count, total, largest) in sorted(self.summaries.items())]
+        return {'counters': counters, 'summaries': summaries}
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.summaries.clear()
+
+    def export(self):
+        # every exporter gets the same snapshot, returns what each of them returned
+        snapshot = self.snapshot()
+        return [exporter(snapshot) for exporter in self.exporters]
+
+
+class PrometheusTextExporter:
+    # text exposition format, counters as <name>_total, summaries as <name>_count / _sum plus a
+    # <name>_max gauge, written atomically to path (e.g. for a node_exporter textfile collector) when one is given
+    def __init__(self, path=None, prefix='wordle_'):
+        self.path = path
+        self.prefix = prefix
+
+    def __call__(self, snapshot):
+        text = self.format(snapshot)
+        if self.path:
+            tmp_path = f'{self.path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(text)
+            os.replace(tmp_path, self.path)
+        return text
+
+    @staticmethod
+    def labels(labels):
+        if not labels:
+            return ''
+        escaped = {k: str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                   for k, v in labels.items()}
+        return '{' + ','.join(f'{k}="{v}"' for k, v in sorted(escaped.items())) + '}'
+
+    @staticmethod
+    def number(value):
+        return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+    def format(self, snapshot):
+        families = defaultdict(list)  # (name, type) -> sample lines, in first seen order
+        for counter in snapshot['counters']:
+            name = f'{self.prefix}{counter["name"]}_total'
+            labels = self.labels(counter['labels'])
+            families[name, 'counter'] += [f'{name}{labels} {self.number(counter["value"])}']
+        for summary in snapshot['summaries']:
+            name = f'{self.prefix}{summary["name"]}'
+            labels = self.labels(summary['labels'])
+            families[name, 'summary'] += [f'{name}_count{labels} {summary["count"]}',
+                                          f'{name}_sum{labels} {self.number(summary["sum"])}']
+            families[f'{name}_max', 'gauge'] += [f'{name}_max{labels} {self.number(summary["max"])}']
+        lines = []
+        for (name, metric_type), samples in families.items():
+            lines += [f'# TYPE {name} {metric_type}'] + samples
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Registry()
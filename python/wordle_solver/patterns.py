@@ -0,0 +1,180 @@
+from functools import lru_cache
+import numpy as np
+
+
+class PatternMatrix:
+    # pattern codes read the outcome as a base 3 number, first letter most significant,
+    # so code i is the i-th outcome of Solver.all_outcomes((0, 1, 2), word_len)
+    def __init__(self, guesses, answers=None, chunk_size=256):
+        self.guesses = list(guesses)
+        self.answers = self.guesses if answers is None else list(answers)
+        self.guess_index = {w: i for i, w in enumerate(self.guesses)}
+        self.answer_index = {w: i for i, w in enumerate(self.answers)}
+        # answer id of every guess, -1 for guesses that can't be answers
+        self.answer_of_guess = np.array([self.answer_index.get(w, -1) for w in self.guesses], dtype=np.intp)
+        self.word_len = len(self.answers[0]) if self.answers else 0
+        self.num_patterns = 3 ** self.word_len
+        self.answer_array = PatternMatrix.encode(self.answers)
+        self.matrix = PatternMatrix.compute(PatternMatrix.encode(self.guesses), self.answer_array, chunk_size)
+
+    def __contains__(self, word):
+        return word in self.answer_index
+
+    def answer_indices(self, words):
+        return np.fromiter((self.answer_index[w] for w in words), dtype=np.intp, count=len(words))
+
+    def guess_indices(self, words):
+        return np.fromiter((self.guess_index[w] for w in words), dtype=np.intp, count=len(words))
+
+    def entropies(self, guess_indices, answer_indices, chunk_size=512, weights=None):
+        # weights: how likely each of answer_indices is, None for equally likely
+        entropies = np.zeros(len(guess_indices))
+        answer_indices = np.asarray(answer_indices, dtype=np.intp)
+        for start in range(0, len(guess_indices), chunk_size):
+            rows = self.matrix[np.ix_(guess_indices[start:start + chunk_size], answer_indices)]
+            entropies[start:start + rows.shape[0]] = PatternMatrix.rows_entropies(rows, self.num_patterns, weights)
+        return entropies
+
+    @staticmethod
+    def rows_entropies(rows, num_patterns, weights=None):
+        # entropy of each row's pattern distribution, H = log2(n) - sum(c log2 c) / n over the partition
+        # sizes c (summed column weights when weights are given, n their total); rows at least as long as
+        # the pattern space count into full histograms, shorter ones sort and count runs so the cost
+        # follows the pool, not the 3^n patterns
+        num_rows, num_answers = rows.shape
+        total = num_answers if weights is None else float(weights.sum())
+        if num_answers >= num_patterns:
+            offsets = np.arange(num_rows, dtype=np.int64)[:, None] * num_patterns
+            row_weights = None if weights is None else np.broadcast_to(weights, rows.shape).ravel()
+            counts = np.bincount((rows + offsets).ravel(), weights=row_weights, minlength=num_rows * num_patterns)
+            counts = counts.astype(np.float64)
+            c_log_c = counts * np.log2(counts, out=np.zeros_like(counts), where=counts > 0)
+            c_log_c = c_log_c.reshape(num_rows, num_patterns).sum(axis=1)
+        else:
+            if weights is None:
+                rows = np.sort(rows, axis=1)
+            else:
+                order = np.argsort(rows, axis=1)
+                rows, row_weights = np.take_along_axis(rows, order, axis=1), weights[order]
+            new_group = np.ones(rows.shape, dtype=bool)
+            new_group[:, 1:] = rows[:, 1:] != rows[:, :-1]
+            new_group = new_group.ravel()
+            if weights is None:
+                counts = np.bincount(np.cumsum(new_group) - 1).astype(np.float64)
+            else:
+                counts = np.add.reduceat(row_weights.ravel(), np.flatnonzero(new_group))
+            group_rows = np.flatnonzero(new_group) // num_answers
+            c_log_c = counts * np.log2(counts, out=np.zeros_like(counts), where=counts > 0)
+            c_log_c = np.bincount(group_rows, weights=c_log_c, minlength=num_rows)
+        return np.log2(total) - c_log_c / total
+
+    def joint_entropies(self, guess_indices, pools, chunk_size=512):
+        # sum of each guess' entropies over several independent pools, scored in one pass: the pools'
+        # columns are gathered side by side and each one's codes offset by num_patterns so a single
+        # sort per row separates both patterns and pools, identical pools are scored once and weighted
+        unique_pools = {}
+        for pool in pools:
+            pool = np.asarray(pool, dtype=np.intp)
+            key = pool.tobytes()
+            weight = unique_pools[key][1] + 1 if key in unique_pools else 1
+            unique_pools[key] = pool, weight
+        pools, weights = zip(*unique_pools.values())
+        sizes = np.array([len(pool) for pool in pools], dtype=np.float64)
+        weights = np.array(weights, dtype=np.float64)
+        columns = np.concatenate(pools)
+        offsets = np.repeat(np.arange(len(pools), dtype=np.int64) * self.num_patterns, sizes.astype(np.intp))
+        entropies = np.zeros(len(guess_indices))
+        for start in range(0, len(guess_indices), chunk_size):
+            rows = np.sort(self.matrix[np.ix_(guess_indices[start:start + chunk_size], columns)] + offsets, axis=1)
+            new_group = np.ones(rows.shape, dtype=bool)
+            new_group[:, 1:] = rows[:, 1:] != rows[:, :-1]
+            group_codes = rows[new_group]
+            counts = np.diff(np.append(np.flatnonzero(new_group.ravel()), rows.size)).astype(np.float64)
+            group_pools = group_codes // self.num_patterns
+            group_rows = np.flatnonzero(new_group) // rows.shape[1]
+            c_log_c = np.bincount(group_rows, weights=weights[group_pools] * counts * np.log2(counts) /
+                                  sizes[group_pools], minlength=rows.shape[0])
+            entropies[start:start + rows.shape[0]] = (weights * np.log2(sizes)).sum() - c_log_c
+        return entropies
+
+    def row(self, guess, answer_indices=None):
+        # patterns of guess against every answer (or only against answer_indices)
+        if guess in self.guess_index:
+            row = self.matrix[self.guess_index[guess]]
+            return row if answer_indices is None else row[answer_indices]
+        answers = self.answer_array if answer_indices is None else self.answer_array[answer_indices]
+        return PatternMatrix.compute(PatternMatrix.encode([guess]), answers)[0]
+
+    @staticmethod
+    def encode(words):
+        # one column per position, bytes for ascii words (letters, nerdle's digits and operators),
+        # code points for any other alphabet
+        if not words:
+            return np.zeros((0, 0), dtype=np.uint8)
+        if len({len(w) for w in words}) > 1:
+            raise ValueError('words need the same length')
+        text = ''.join(words)
+        if text.isascii():
+            return np.frombuffer(text.encode('ascii'), dtype=np.uint8).reshape(len(words), -1)
+        return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).reshape(len(words), -1)
+
+    @staticmethod
+    def pattern_dtype(word_len):
+        # smallest dtype that holds every code, uint8 stops at 5 letters (3^5 = 243)
+        for dtype in (np.uint8, np.uint16, np.uint32):
+            if 3 ** word_len <= np.iinfo(dtype).max + 1:
+                return dtype
+        raise ValueError(f'words of {word_len} letters have too many patterns')
+
+    @staticmethod
+    def compute(guess_array, answer_array, chunk_size=256):
+        num_guesses, word_len = guess_array.shape
+        matrix = np.zeros((num_guesses, answer_array.shape[0]), dtype=PatternMatrix.pattern_dtype(word_len))
+        for start in range(0, num_guesses, chunk_size):
+            guesses = guess_array[start:start + chunk_size]
+            matrix[start:start + chunk_size] = PatternMatrix._compute_chunk(guesses, answer_array, word_len)
+        return matrix
+
+    @staticmethod
+    def _compute_chunk(guesses, answers, word_len):
+        # same rules as Wordle.score: greens first, then yellows left to right while the
+        # letter still has unmatched occurrences in the answer
+        green = guesses[:, None, :] == answers[None, :, :]
+        not_green = ~green
+        codes = np.zeros(green.shape[:2], dtype=np.int32)
+        for i in range(word_len):
+            letter = guesses[:, i, None]
+            available = np.zeros(green.shape[:2], dtype=np.int8)
+            for j in range(word_len):
+                available += (answers[None, :, j] == letter) & not_green[:, :, j]
+            used = np.zeros(green.shape[:2], dtype=np.int8)
+            for k in range(i):
+                used += (guesses[:, k, None] == letter) & not_green[:, :, k]
+            yellow = not_green[:, :, i] & (used < available)
+            codes = codes * 3 + 2 * green[:, :, i] + yellow
+        return codes
+
+    @staticmethod
+    def pattern_code(outcome):
+        code = 0
+        for o in outcome:
+            code = code * 3 + o
+        return code
+
+    @staticmethod
+    def outcome(code, word_len):
+        outcome = []
+        for _ in range(word_len):
+            code, o = divmod(code, 3)
+            outcome.append(o)
+        return outcome[::-1]
+
+
+@lru_cache(maxsize=8)
+def _cached_pattern_matrix(guesses, answers):
+    return PatternMatrix(guesses, answers)
+
+
+def get_pattern_matrix(guesses, answers=None):
+    # solvers and runners built on the same corpus share one matrix
+    return _cached_pattern_matrix(tuple(guesses), None if answers is None else tuple(answers))
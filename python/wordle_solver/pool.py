@@ -0,0 +1,77 @@
+from collections.abc import Sequence
+import numpy as np
+
+
+class WordPool(Sequence):
+    # some words of a shared vocabulary held as an array of word ids (in pool order), never as a copy of
+    # the strings: sub-pools are views of the same vocabulary and two pools over it intersect through a
+    # bitset (one bool per vocabulary word) of one of them
+    def __init__(self, words, indices=None, word_ids=None):
+        self.words = words if isinstance(words, (list, tuple)) else list(words)  # shared, never modified
+        self.indices = np.arange(len(self.words)) if indices is None else indices
+        self.word_ids = word_ids  # word -> id if the vocabulary's owner has one, a scan of words otherwise
+
+    def word_id(self, word):
+        if self.word_ids is not None:
+            return self.word_ids.get(word)
+        try:
+            return self.words.index(word)
+        except ValueError:
+            return None
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return WordPool(self.words, self.indices[i], self.word_ids)
+        return self.words[self.indices[i]]
+
+    def __iter__(self):
+        words = self.words
+        return (words[i] for i in self.indices.tolist())
+
+    def __contains__(self, word):
+        return self.position(word) is not None
+
+    def __eq__(self, other):
+        if not isinstance(other, (WordPool, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and list(self) == list(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'WordPool({len(self)} of {len(self.words)} words)'
+
+    def mask(self):
+        mask = np.zeros(len(self.words), dtype=bool)
+        mask[self.indices] = True
+        return mask
+
+    def subset(self, keep):
+        # the words where keep (one bool per pool word) is set, same vocabulary and order
+        return WordPool(self.words, self.indices[keep], self.word_ids)
+
+    def intersection(self, other):
+        if other.words is not self.words:
+            raise ValueError('pools over different vocabularies')
+        return self.subset(other.mask()[self.indices])
+
+    def position(self, word):
+        # first position of word in the pool, None when it isn't in it
+        i = self.word_id(word)
+        if i is None:
+            return None
+        positions = np.flatnonzero(self.indices == i)
+        if len(positions):
+            return int(positions[0])
+        # a vocabulary with duplicates maps word to one of its ids, another copy may still be in the pool
+        return next((p for p, w in enumerate(self) if w == word), None)
+
+    def remove(self, word):
+        # like list.remove, ValueError when word isn't in the pool, views taken before keep their words
+        position = self.position(word)
+        if position is None:
+            raise ValueError(f'{word} is not in the pool')
+        self.indices = np.delete(self.indices, position)
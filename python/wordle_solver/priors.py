@@ -0,0 +1,33 @@
+import hashlib
+import os
+from importlib import metadata
+import numpy as np
+from .corpus import CORPUS_DIR
+
+_loaded = {}  # cache key -> weights, one per process
+
+
+def frequency_priors(words, lang='en', center=-6., width=1., floor=1e-3):
+    # how likely each word is to be the answer, aligned to words: a sigmoid over log10 word frequency,
+    # common words near 1, obscure ones near floor but never zero so they can still be found;
+    # computed once per corpus into ./corpora, wordfreq is only imported when that file is missing
+    words = list(words)
+    key = hashlib.sha256(repr((words, lang, center, width, floor, metadata.version('wordfreq'))).encode())
+    key = key.hexdigest()[:16]
+    if key in _loaded:
+        return _loaded[key]
+    path = os.path.join(CORPUS_DIR, f'priors-{key}.npy')
+    if os.path.exists(path):
+        weights = np.load(path)
+    else:
+        from wordfreq import word_frequency
+        frequencies = np.array([word_frequency(w, lang) for w in words], dtype=np.float64)
+        log_frequencies = np.log10(frequencies, out=np.full_like(frequencies, -12.), where=frequencies > 0)
+        weights = floor + (1 - floor) / (1 + np.exp(-(log_frequencies - center) / width))
+        os.makedirs(CORPUS_DIR, exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp.npy'
+        np.save(tmp_path, weights)
+        os.replace(tmp_path, path)
+    weights.flags.writeable = False
+    _loaded[key] = weights
+    return weights
@@ -0,0 +1,76 @@
+import json
+import math
+import os
+from collections import Counter
+
+
+class ResultsSink:
+    # append-only JSON lines file, a header line with the run's solver config and corpus hash then one
+    # line per finished game, flushed as it's written so a crashed run loses at most the game in flight
+    def __init__(self, path, solver_config, corpus_hash):
+        self.path = path
+        self.header = {'solver_config': solver_config, 'corpus_hash': corpus_hash}
+
+    def records(self):
+        # games already in the file, a half written last line (crash mid write) is cut off
+        if not os.path.exists(self.path):
+            return []
+        records, good_size = [], 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                good_size += len(line)
+                records += [record]
+        if good_size != os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_size)
+        if not records:
+            return []
+        if records[0] != self.header:
+            raise ValueError(f'{self.path} holds results of another run: {records[0]}')
+        return records[1:]
+
+    def open(self):
+        f = open(self.path, 'a')
+        if f.tell() == 0:
+            f.write(json.dumps(self.header) + '\n')
+            f.flush()
+        return f
+
+    @staticmethod
+    def write(f, record):
+        f.write(json.dumps(record) + '\n')
+        f.flush()
+
+
+class RunningStats:
+    # summary of the number of guesses per game, updated one game at a time (Welford for the variance)
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.
+        self.m2 = 0.
+        self.min = None
+        self.max = None
+        self.histogram = Counter()
+
+    def add(self, num_guesses):
+        self.count += 1
+        delta = num_guesses - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (num_guesses - self.mean)
+        self.min = num_guesses if self.min is None else min(self.min, num_guesses)
+        self.max = num_guesses if self.max is None else max(self.max, num_guesses)
+        self.histogram[num_guesses] += 1
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / self.count) if self.count else 0.
+
+    def summary(self):
+        return {'games': self.count, 'mean': self.mean, 'std': self.std, 'min': self.min, 'max': self.max,
+                'histogram': dict(sorted(self.histogram.items()))}
@@ -1,12 +1,18 @@
 import pickle
 import os
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
-from .wordle import Wordle
-from .solvers import GreedyEntropySolver
+from .wordle import MultiWordle, Wordle
+from .solvers import GreedyEntropySolver, MultiBoardSolver
+from .cache import EntropyCache
+from .results import ResultsSink, RunningStats
+from .metrics import metrics
+from .simulate import BatchSimulator
 
 
 class Runner:
-    def __init__(self, corpus_name='five_letter_words', wordle=None, solver=None, seed=None, debug_log=True):
+    def __init__(self, corpus_name='five_letter_words', wordle=None, solver=None, seed=None, debug_log=True,
+                 cache_path='./entropies/entropies.sqlite'):
         self.wordle = wordle if wordle else Wordle(seed=seed, debug_log=debug_log)
         if seed:
             self.wordle.seed = seed
@@ -15,8 +21,8 @@ class Runner:
         self.entropies_file_prefix = f'./entropies/{corpus_name}'
         if not os.path.isdir(self.entropies_file_prefix):
             os.mkdir(self.entropies_file_prefix)
-        self.init_entropies_file = f'{self.entropies_file_prefix}/init_entropies.pickle'
         self.game_entropies_file = f'{self.entropies_file_prefix}/game_entropies.pickle'
+        self.cache = EntropyCache(cache_path, corpus_name, self.solver.corpus, self.solver.config)
         self.init_best_guess = self.get_init_best_guess()
 
     def play(self, target=None):
@@ -27,25 +33,45 @@ class Runner:
         else:
             self.wordle.new_game(target=target)
         entropies = {}
+        self.turns = []  # [guess, outcome, entropy of the guess when it was picked (unknown for the opening)]
         self.solver.reset()
-        best_guess = self.init_best_guess
+        best_guess, best_entropy = self.init_best_guess, None
         guess_is_successful = False
         while not guess_is_successful:
             guess_is_successful, outcome = self.wordle.guess(best_guess)
-            print('TARGET: ', target, '| GUESS: ', best_guess, '| OUTCOME: ', outcome)
+            self.turns += [[best_guess, ''.join(str(o) for o in outcome), best_entropy]]
+            if self.debug_log:
+                print('TARGET: ', target, '| GUESS: ', best_guess, '| OUTCOME: ', outcome)
             if guess_is_successful:
-                print('GOT IT!: ', self.wordle.num_guesses, 'tries')
+                if self.debug_log:
+                    print('GOT IT!: ', self.wordle.num_guesses, 'tries')
                 break
-            self.solver.update_pool(best_guess, outcome)
             prev_guess = best_guess  # for logging entropies only
-            if self.wordle.num_guesses == 1:
-                best_guess, guess_entropies = self.load_or_calculate_entropies(best_guess, outcome)
-            else:
-                best_guess, guess_entropies = self.solver.get_best_guess()
+            with metrics.timer('turn_seconds', turn=self.wordle.num_guesses + 1):
+                self.solver.update_pool(best_guess, outcome)
+                if self.wordle.num_guesses == 1:
+                    best_guess, guess_entropies = self.load_or_calculate_entropies(best_guess, outcome)
+                else:
+                    best_guess, guess_entropies = self.solver.get_best_guess()
+            best_entropy = guess_entropies.get(best_guess)
             entropies[(target, prev_guess, self.wordle.num_guesses)] = guess_entropies
+        metrics.inc('games')
+        metrics.inc('guesses', self.wordle.num_guesses)
         return target, entropies
 
-    def play_all(self):
+    def play_all(self, num_workers=1):
+        if num_workers > 1:
+            nums_of_tries, entropies = self.play_all_parallel(num_workers)
+        else:
+            nums_of_tries, entropies = self.play_all_serial()
+        with open(self.game_entropies_file, 'wb+') as f:
+            pickle.dump(entropies, f)
+        print('mean num tries', sum(nums_of_tries.values()) / len(nums_of_tries.values()))
+        print('max, min num tries', max(nums_of_tries.values()), min(nums_of_tries.values()))
+        plt.hist(nums_of_tries.values(), bins=range(1, max(nums_of_tries.values()) + 2))
+        return nums_of_tries
+
+    def play_all_serial(self):
         nums_of_tries = {}
         entropies = {}
         target = ''
@@ -54,40 +80,169 @@ class Runner:
             if target and target_entropies:
                 entropies.update(target_entropies)
                 nums_of_tries[target] = self.wordle.num_guesses
-        with open(self.game_entropies_file, 'wb+') as f:
-            pickle.dump(entropies, f)
-        print('mean num tries', sum(nums_of_tries.values()) / len(nums_of_tries.values()))
+        return nums_of_tries, entropies
+
+    def play_all_parallel(self, num_workers):
+        # targets are drawn up front in the same seeded order as the serial run, each worker gets
+        # its own copy of this runner and results are merged back in draw order
+        targets = self.draw_targets()
+        chunks = Runner.chunk_targets(targets, num_workers)
+        nums_of_tries = {}
+        entropies = {}
+        with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker, initargs=(self,)) as executor:
+            for results in executor.map(_play_targets, chunks):
+                for target, num_guesses, target_entropies in results:
+                    if target_entropies:
+                        entropies.update(target_entropies)
+                        nums_of_tries[target] = num_guesses
+        return nums_of_tries, entropies
+
+    def play_all_batched(self):
+        # the same games as play_all, advanced together turn by turn, only the number of guesses is kept
+        # and games won by the opening count too
+        targets = self.draw_targets()
+        self.solver.reset()
+        nums_of_tries = BatchSimulator(self.solver).run(targets, self.init_best_guess)
+        print('mean num tries', sum(nums_of_tries.values()) / len(nums_of_tries))
         print('max, min num tries', max(nums_of_tries.values()), min(nums_of_tries.values()))
-        plt.hist(nums_of_tries.values(), bins=range(1, max(nums_of_tries.values()) + 2))
         return nums_of_tries
 
+    def evaluate(self, results_path, num_workers=1):
+        # play_all without holding every game in memory, the stats are kept online over the results file
+        stats = RunningStats()
+        for _ in self.play_stream(results_path, num_workers, stats):
+            pass
+        summary = stats.summary()
+        print('mean num tries', summary['mean'])
+        print('max, min num tries', summary['max'], summary['min'])
+        return stats
+
+    def play_stream(self, results_path, num_workers=1, stats=None):
+        # plays every target not in results_path yet, appending each game as it finishes and yielding it,
+        # rerunning after a crash picks up where the file ends, stats also gets the games already there
+        sink = ResultsSink(results_path, self.solver.config, self.cache.corpus_hash)
+        done = set()
+        for record in sink.records():
+            done.add(record['target'])
+            if stats is not None:
+                stats.add(record['num_guesses'])
+        targets = [target for target in self.draw_targets() if target not in done]
+        with sink.open() as f:
+            for record in self.play_records(targets, num_workers):
+                ResultsSink.write(f, record)
+                if stats is not None:
+                    stats.add(record['num_guesses'])
+                yield record
+
+    def play_records(self, targets, num_workers=1):
+        if num_workers <= 1:
+            for target in targets:
+                yield self.play_record(target)
+            return
+        chunks = Runner.chunk_targets(targets, num_workers)
+        with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker, initargs=(self,)) as executor:
+            for records in executor.map(_play_records, chunks):
+                yield from records
+
+    def play_record(self, target):
+        self.play(target=target)
+        return {'target': target, 'num_guesses': self.wordle.num_guesses, 'turns': self.turns}
+
+    @staticmethod
+    def chunk_targets(targets, num_workers):
+        chunk_size = max(1, len(targets) // (num_workers * 8))
+        return [targets[i:i + chunk_size] for i in range(0, len(targets), chunk_size)]
+
+    def draw_targets(self):
+        targets = []
+        target = self.wordle.new_game()
+        while target:
+            targets += [target]
+            target = self.wordle.new_game()
+        return targets
+
     def get_init_best_guess(self):
-        try:
-            with open(self.init_entropies_file, 'rb') as f:
-                init_entropies = pickle.load(f)
-                init_best_guess = reversed(sorted(init_entropies, key=init_entropies.get)).__next__()
-        except FileNotFoundError:
+        init_best_guess = self.cache.get_best_guess([])
+        if init_best_guess is None:
             init_best_guess, init_entropies = self.solver.get_best_guess()
-            with open(self.init_entropies_file, 'wb+') as f:
-                pickle.dump(init_entropies, f)
-            print('init entropies',
-                  [(w, init_entropies[w]) for w in reversed(sorted(init_entropies, key=init_entropies.get))])
+            self.cache.put([], init_best_guess, init_entropies)
+            if self.debug_log:
+                print('init entropies',
+                      [(w, init_entropies[w]) for w in reversed(sorted(init_entropies, key=init_entropies.get))])
         return init_best_guess
 
     def load_or_calculate_entropies(self, guess, outcome):
-        file_name = f'{self.entropies_file_prefix}/{guess}_{"".join([str(o) for o in outcome])}.pickle'
-        try:
-            with open(file_name, 'rb') as f:
-                guess_entropies = pickle.load(f)
-                best_guess = max(guess_entropies, key=guess_entropies.get)
-                print('loaded entropies from file')
-        except FileNotFoundError:
-            print('file not found, calculating entropies')
+        history = [(guess, outcome)]
+        best_guess, guess_entropies = self.cache.get(history)
+        if best_guess is not None:
+            metrics.inc('cache_hits')
+            if self.debug_log:
+                print('loaded entropies from cache')
+        else:
+            metrics.inc('cache_misses')
+            if self.debug_log:
+                print('not in cache, calculating entropies')
             best_guess, guess_entropies = self.solver.get_best_guess()
-            with open(file_name, 'wb') as f:
-                pickle.dump(guess_entropies, f)
+            self.cache.put(history, best_guess, guess_entropies)
         return best_guess, guess_entropies
 
+
+class MultiRunner:
+    # plays multi board games, the opening is scored once and reused by every game
+    def __init__(self, num_boards=4, wordle=None, solver=None, seed=None, debug_log=False):
+        self.wordle = wordle if wordle else MultiWordle(num_boards, seed=seed)
+        self.solver = solver if solver else MultiBoardSolver(num_boards=num_boards, debug_log=debug_log)
+        if self.solver.num_boards != self.wordle.num_boards:
+            raise ValueError('solver and game need the same number of boards')
+        self.debug_log = debug_log
+        self.solver.reset()
+        self.init_best_guess, _ = self.solver.get_best_guess()
+
+    def play(self, targets=None):
+        targets = self.wordle.new_game(targets)
+        self.solver.reset()
+        best_guess = self.init_best_guess
+        while True:
+            all_solved, outcomes = self.wordle.guess(best_guess)
+            if self.debug_log:
+                print('TARGETS: ', targets, '| GUESS: ', best_guess, '| OUTCOMES: ', outcomes)
+            if all_solved:
+                break
+            with metrics.timer('turn_seconds', turn=self.wordle.num_guesses + 1, boards=self.wordle.num_boards):
+                self.solver.update_pool(best_guess, outcomes)
+                best_guess, _ = self.solver.get_best_guess()
+        metrics.inc('games', boards=self.wordle.num_boards)
+        return targets, self.wordle.num_guesses
+
+    def play_all(self, num_games):
+        stats = RunningStats()
+        for _ in range(num_games):
+            _, num_guesses = self.play()
+            stats.add(num_guesses)
+        print('mean num tries', stats.mean)
+        print('max, min num tries', stats.max, stats.min)
+        return stats
+
+
+_worker_runner = None
+
+
+def _init_worker(runner):
+    global _worker_runner
+    _worker_runner = runner
+
+
+def _play_targets(targets):
+    results = []
+    for target in targets:
+        _, target_entropies = _worker_runner.play(target=target)
+        results += [(target, _worker_runner.wordle.num_guesses, target_entropies)]
+    return results
+
+
+def _play_records(targets):
+    return [_worker_runner.play_record(target) for target in targets]
+
 # def graph_outcomes(word, corpus=five_letter_words, outcomes=None):
 #     if not outcomes:
 #         outcomes = all_outcomes((0, 1, 2), 5)
@@ -0,0 +1,128 @@
+import argparse
+import asyncio
+import itertools
+import json
+from concurrent.futures import ThreadPoolExecutor
+from .metrics import metrics, PrometheusTextExporter
+from .patterns import PatternMatrix
+from .solvers import GreedyEntropySolver, Solver
+
+
+class Engine:
+    # read-only view of a warm solver's corpus and pattern matrix, safe to share between sessions and threads
+    def __init__(self, solver=None):
+        self.solver = solver if solver else GreedyEntropySolver()
+        self.patterns = self.solver.corpus_patterns
+        self.all_indices = self.patterns.answer_indices(self.solver.corpus)
+        self.all_correct = self.patterns.num_patterns - 1
+        self.early_guesses = {}  # history -> best guess, only for the first two turns every game shares
+
+    def best_guess(self, pool_indices, history=()):
+        if len(history) <= 1 and history in self.early_guesses:
+            return self.early_guesses[history]
+        best_index, _, _ = self.solver.best_guess_for(pool_indices)
+        best_guess = self.patterns.guesses[best_index]
+        if len(history) <= 1:
+            self.early_guesses[history] = best_guess
+        return best_guess
+
+    def filter(self, pool_indices, guess, code):
+        return pool_indices[self.patterns.row(guess, pool_indices) == code]
+
+
+class Session:
+    __slots__ = ('pool_indices', 'history')
+
+    def __init__(self, pool_indices):
+        self.pool_indices = pool_indices
+        self.history = ()
+
+
+class SolverService:
+    # many independent games on one shared engine, scoring runs on the executor so the loop never blocks
+    ops = ('new', 'suggest', 'feedback', 'end', 'metrics')
+
+    def __init__(self, engine=None, executor=None):
+        self.engine = engine if engine else Engine()
+        self.executor = executor if executor else ThreadPoolExecutor()
+        self.sessions = {}
+        self.session_ids = itertools.count()
+
+    def new_game(self):
+        session_id = next(self.session_ids)
+        self.sessions[session_id] = Session(self.engine.all_indices)
+        return session_id
+
+    def end_game(self, session_id):
+        self.get_session(session_id)
+        del self.sessions[session_id]
+
+    def get_session(self, session_id):
+        if session_id not in self.sessions:
+            raise KeyError(f'no game {session_id}')
+        return self.sessions[session_id]
+
+    async def suggest(self, session_id):
+        session = self.get_session(session_id)
+        if not len(session.pool_indices):
+            raise ValueError('no words left matching the feedback')
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, self.engine.best_guess, session.pool_indices, session.history)
+
+    async def feedback(self, session_id, guess, outcome):
+        session = self.get_session(session_id)
+        code = PatternMatrix.pattern_code(outcome)
+        loop = asyncio.get_running_loop()
+        session.pool_indices = await loop.run_in_executor(
+            self.executor, self.engine.filter, session.pool_indices, guess, code)
+        session.history += ((guess, code),)
+        return len(session.pool_indices)
+
+    async def handle(self, request):
+        op = request.get('op')
+        metrics.inc('service_requests', op=op if op in SolverService.ops else 'unknown')
+        if op == 'new':
+            return {'session': self.new_game()}
+        if op == 'suggest':
+            return {'guess': await self.suggest(request['session'])}
+        if op == 'feedback':
+            remaining = await self.feedback(request['session'], request['guess'], request['outcome'])
+            return {'remaining': remaining}
+        if op == 'end':
+            self.end_game(request['session'])
+            return {}
+        if op == 'metrics':
+            return {'metrics': PrometheusTextExporter().format(metrics.snapshot())}
+        raise ValueError(f'unknown op {op}')
+
+    async def serve_stream(self, reader, writer):
+        # one JSON request per line, one JSON response per line
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                response = await self.handle(json.loads(line))
+            except (KeyError, ValueError, TypeError) as e:
+                response = {'error': str(e)}
+            writer.write((json.dumps(response) + '\n').encode())
+            await writer.drain()
+        writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        server = await asyncio.start_server(self.serve_stream, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='JSON lines wordle solver service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--allowed-guesses', action='store_true', help='guess from all allowed words, not only the pool')
+    parser.add_argument('--metrics', action='store_true', help="collect metrics, served by the 'metrics' op")
+    args = parser.parse_args()
+    metrics.enabled = args.metrics
+    solver = GreedyEntropySolver(guesses=Solver.allowed_guesses() if args.allowed_guesses else None)
+    asyncio.run(SolverService(Engine(solver)).serve(args.host, args.port))
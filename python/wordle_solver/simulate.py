@@ -0,0 +1,42 @@
+import numpy as np
+from .metrics import metrics
+
+
+class BatchSimulator:
+    # plays many targets in lockstep under a pool-based solver's policy: games with the same history
+    # share a pool, so each distinct pool is scored once per turn and every target in it gets its
+    # feedback from one lookup into the pattern matrix
+    def __init__(self, solver):
+        self.solver = solver
+        self.patterns = solver.patterns
+
+    def run(self, targets, opening=None):
+        # -> {target: num_guesses} in targets order, opening is the first guess if it's already known
+        targets = list(targets)
+        unknown = [t for t in targets if t not in self.patterns]
+        if unknown:
+            raise ValueError(f'targets not in the solver corpus: {unknown[:5]}')
+        answer_ids = self.patterns.answer_indices(targets)
+        all_correct = self.patterns.num_patterns - 1
+        initial_pool_indices = self.solver.pool_indices
+        num_guesses = np.zeros(len(targets), dtype=np.int32)
+        groups = [(initial_pool_indices, np.arange(len(targets)), opening)]
+        turn = 1
+        try:
+            while groups:
+                metrics.observe('batch_states', len(groups), turn=turn)
+                next_groups = []
+                for pool_indices, members, guess in groups:
+                    if guess is None:
+                        self.solver.restrict_pool(pool_indices)
+                        guess, _ = self.solver.get_best_guess()
+                    codes = self.patterns.row(guess, answer_ids[members])
+                    num_guesses[members[codes == all_correct]] = turn
+                    pool_codes = self.patterns.row(guess, pool_indices)
+                    for code in np.unique(codes[codes != all_correct]):
+                        next_groups += [(pool_indices[pool_codes == code], members[codes == code], None)]
+                groups = next_groups
+                turn += 1
+        finally:
+            self.solver.restrict_pool(initial_pool_indices)
+        return dict(zip(targets, num_guesses.tolist()))
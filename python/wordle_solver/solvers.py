@@ -1,36 +1,85 @@
+import hashlib
+import itertools
 import math
 from collections import Counter
-from english_words import english_words_lower_alpha_set
+from importlib import metadata
 from abc import ABC, abstractmethod
+import numpy as np
+from .corpus import file_source, load_corpus
+from .patterns import get_pattern_matrix, PatternMatrix
+from .constraints import get_constraint_index
+from .pool import WordPool
+from .state import PoolState
+from .metrics import metrics
 
 
 class Solver(ABC):
+    # bump when a change alters which guesses get picked, cached entropies are keyed on it
+    version = 4
+    # bump when build_default_corpus changes which words it returns or their order, the built corpora are
+    # fingerprinted with it so stale ones are rebuilt
+    corpus_version = 2
+
     def __init__(self, corpus=None, outcomes=None, debug_log=False):
         self.corpus = corpus if corpus else Solver.default_corpus()
-        self.outcomes = outcomes if outcomes else Solver.all_outcomes((0, 1, 2), 5)
+        self.word_len = len(self.corpus[0])
+        self._outcomes = outcomes  # built on first use, nothing on the hot paths walks all 3^word_len of them
         self.debug_log = debug_log
         if debug_log:
             print('solver initialized with default corpus, num words:', len(self.corpus))
 
+    @property
+    def outcomes(self):
+        if self._outcomes is None:
+            self._outcomes = Solver.all_outcomes((0, 1, 2), self.word_len)
+        return self._outcomes
+
+    @staticmethod
+    def default_corpus(word_len=5):
+        # built once into ./corpora, every solver and wordle afterwards shares the same list
+        if word_len != 5:
+            return load_corpus(f'{word_len}_letter_words', lambda: Solver.build_default_corpus(word_len),
+                               lambda: (Solver.corpus_version, metadata.version('english-words'))).words
+        return load_corpus('five_letter_words', Solver.build_default_corpus, lambda: (
+            Solver.corpus_version, metadata.version('english-words'),
+            file_source('./data/wordle_possible_answers.txt'))).words
+
     @staticmethod
-    def default_corpus():
-        five_letter_words = [w for w in english_words_lower_alpha_set if len(w) == 5 and w.isalpha()]
+    def build_default_corpus(word_len=5):
+        from english_words import english_words_lower_alpha_set
+        # sorted: set order changes with the hash seed, and tie breaks and seeded target draws follow corpus order
+        words = sorted(w for w in english_words_lower_alpha_set if len(w) == word_len and w.isalpha())
+        if word_len != 5:
+            return words
         with open('./data/wordle_possible_answers.txt', 'r') as f:
             wordle_official_list = [line.strip() for line in f.readlines()]
-        five_letter_words += [w for w in wordle_official_list if w not in five_letter_words]
-        five_letter_words += ['tares']
+        five_letter_words = list(dict.fromkeys(words + wordle_official_list))
+        if 'tares' not in five_letter_words:
+            five_letter_words += ['tares']
         return five_letter_words
 
+    @staticmethod
+    def allowed_guesses():
+        files = ['./data/wordle_allowed_guesses.txt', './data/wordle_possible_answers.txt']
+        return load_corpus('wordle_allowed_guesses', lambda: Solver.build_allowed_guesses(files),
+                           lambda: [file_source(f) for f in files]).words
+
+    @staticmethod
+    def build_allowed_guesses(files):
+        guesses = []
+        for file_name in files:
+            with open(file_name, 'r') as f:
+                guesses += [line.strip() for line in f.readlines()]
+        return guesses
+
     @staticmethod
     def all_outcomes(element_wise_outcomes, size):
-        if size == 0:
-            return [[]]
-        elif size == 1:
-            return [[e] for e in element_wise_outcomes]
-        out = []
-        for e in element_wise_outcomes:
-            out += [[e] + o for o in Solver.all_outcomes(element_wise_outcomes, size - 1)]
-        return out
+        # every outcome, first position most significant, only for tests and display, 3^size of them
+        return [list(o) for o in itertools.product(element_wise_outcomes, repeat=size)]
+
+    @property
+    def config(self):
+        return f'{type(self).__name__}-v{self.version}'
 
     @abstractmethod
     def get_best_guess(self):
@@ -44,8 +93,8 @@ class Solver(ABC):
 class EntropySolver(Solver, ABC):
     def __init__(self, corpus=None, outcomes=None, debug_log=False):
         super().__init__(corpus, outcomes, debug_log)
-        num_bits_uncertainty = math.log(len(self.corpus), 2)
-        print('bits of info to uncover:', num_bits_uncertainty)
+        if debug_log:
+            print('bits of info to uncover:', math.log(len(self.corpus), 2))
 
     @abstractmethod
     def update_pool(self, guess, outcome):
@@ -57,59 +106,183 @@ class EntropySolver(Solver, ABC):
 
     @staticmethod
     def calc_entropy(outcome_probabilities):
-        return - sum([p * math.log(p, 2) for p in outcome_probabilities])
+        # works on a single distribution or a stack of them along the last axis, zeros contribute 0
+        p = np.asarray(outcome_probabilities, dtype=np.float64)
+        log_p = np.log2(p, out=np.zeros_like(p), where=p > 0)
+        return - np.sum(p * log_p, axis=-1)
 
 
 class GreedyEntropySolver(EntropySolver):
-    def __init__(self, corpus=None, outcomes=None, debug_log=False):
+    def __init__(self, corpus=None, outcomes=None, debug_log=False, guesses=None, priors=None):
         super().__init__(corpus, outcomes, debug_log)
         # TODO private vars and methods???
+        # priors: how likely each corpus word is to be the answer (e.g. priors.frequency_priors), None for
+        # equally likely, pattern probabilities are then weighted sums instead of word counts
+        self.priors = None if priors is None else np.asarray(priors, dtype=np.float64)
+        if self.priors is not None:
+            if self.priors.shape != (len(self.corpus),):
+                raise ValueError('priors need one weight per corpus word')
+            self.priors_hash = hashlib.sha256(self.priors.tobytes()).hexdigest()[:16]
+        # without guesses only words still in the pool are guessed, with guesses any of them (plus the corpus)
+        # is scored against the pool
+        self.guesses = list(dict.fromkeys(list(guesses) + self.corpus)) if guesses else None
+        if self.guesses:
+            self.corpus_patterns = get_pattern_matrix(self.guesses, self.corpus)
+            self.guesses_hash = hashlib.sha256('\n'.join(sorted(self.guesses)).encode()).hexdigest()[:16]
+        else:
+            self.corpus_patterns = get_pattern_matrix(self.corpus)
+        self.patterns = self.corpus_patterns
+        self._constraints = None
         self.pool = self.corpus
-        self.correct, self.present, self.present_positions, self.not_present = (None,) * 4
+
+    @property
+    def config(self):
+        config = super().config
+        if self.guesses:
+            config += f'-guesses-{self.guesses_hash}'
+        if self.priors is not None:
+            config += f'-priors-{self.priors_hash}'
+        return config
 
     def get_best_guess(self):
-        entropies = {}
-        print(f'getting entropies for {len(self.pool)} words')
-        for idx, word in enumerate(self.pool):
-            entropy, _ = self.get_entropy(word)
-            entropies[word] = entropy
-            if self.debug_log:
-                print(f'{idx}/{len(self.pool) - 1}', word, entropy)
-        best_guess = max(entropies, key=entropies.get)
+        if self.debug_log:
+            print(f'getting entropies for {len(self.pool)} words')
+        with metrics.timer('best_guess_seconds', solver=type(self).__name__):
+            candidates, candidate_entropies = self.score_state()
+            best_index = self.pick(candidates, candidate_entropies, self.pool_indices)
+            best_guess = self.patterns.guesses[best_index]
+            entropies = self.top_entropies(candidates, candidate_entropies)
+            entropies.setdefault(best_guess, float(candidate_entropies[np.argmax(candidates == best_index)]))
+        if self.debug_log:
+            print('best guess', best_guess, entropies[best_guess])
         return best_guess, entropies  # todo are entropies actually needed
 
+    def best_guess_for(self, pool_indices):
+        # doesn't touch the solver's own pool, so a warm solver can score pools for many games
+        candidates = self.candidate_indices(pool_indices)
+        metrics.observe('pool_size', len(pool_indices))
+        metrics.inc('entropies_computed', len(candidates))
+        entropies = self.patterns.entropies(candidates, pool_indices, weights=self.pool_weights(pool_indices))
+        return self.pick(candidates, entropies, pool_indices), candidates, entropies
+
+    def score_state(self):
+        metrics.observe('pool_size', len(self.pool_indices))
+        metrics.inc('entropies_computed', len(self.state.candidates))
+        return self.state.candidates, self.state.entropies()
+
+    def top_entropies(self, candidates, candidate_entropies):
+        # with a separate guess vocabulary only the len(pool) best candidates are returned, runners keep
+        # every turn's entropies and a full vocabulary per turn adds up over play_all
+        if len(candidates) > len(self.pool_indices):
+            top = np.sort(np.argpartition(-candidate_entropies, len(self.pool_indices) - 1)[:len(self.pool_indices)])
+            candidates, candidate_entropies = candidates[top], candidate_entropies[top]
+        return dict(zip([self.patterns.guesses[i] for i in candidates], candidate_entropies.tolist()))
+
+    def candidate_indices(self, pool_indices):
+        # a pool-only matrix is square, so answer ids double as guess ids
+        if not self.guesses or self.patterns is not self.corpus_patterns:
+            return pool_indices
+        return np.arange(len(self.patterns.guesses))
+
+    def new_state(self, pool_indices):
+        # PoolState takes None for candidates when guesses come from the pool itself
+        candidates = self.candidate_indices(pool_indices)
+        return PoolState(self.patterns, pool_indices, None if candidates is pool_indices else candidates,
+                         weights=self.answer_weights())
+
+    def answer_weights(self):
+        # priors line up with the corpus matrix's answers, a pool set from outside the corpus is uniform
+        return self.priors if self.patterns is self.corpus_patterns else None
+
+    def pool_weights(self, pool_indices):
+        weights = self.answer_weights()
+        return None if weights is None else weights[pool_indices]
+
+    def pick(self, candidates, entropies, pool_indices):
+        # among the top entropies prefer a guess that could still be the answer, with priors a guess
+        # also scores its chance of being the answer, a bit per expected win on this turn
+        weights = self.pool_weights(pool_indices)
+        if weights is not None:
+            probabilities = np.zeros(len(self.patterns.answers))
+            probabilities[pool_indices] = weights / weights.sum()
+            answer_ids = self.patterns.answer_of_guess[candidates]
+            entropies = entropies + np.where(answer_ids >= 0, probabilities[answer_ids], 0.)
+        tied = candidates[entropies >= entropies.max() - 1e-12]
+        in_pool = np.isin(self.patterns.answer_of_guess[tied], pool_indices)
+        return tied[int(np.argmax(in_pool))]
+
+    def get_entropies(self, guesses=None):
+        # entropy of every guess (the state's candidates by default) against the current pool, as one vector
+        if guesses is None:
+            return self.state.entropies()
+        guess_indices = self.patterns.guess_indices(guesses)
+        weights = self.pool_weights(self.pool_indices)
+        return self.patterns.entropies(guess_indices, self.pool_indices, weights=weights)
+
+    @property
+    def pool(self):
+        # a view of the pool ids over the matrix's answers, the strings are never copied per turn
+        return WordPool(self.patterns.answers, self.pool_indices, self.patterns.answer_index)
+
+    @pool.setter
+    def pool(self, words):
+        if isinstance(words, WordPool) and words.words is self.corpus_patterns.answers:
+            patterns, pool_indices = self.corpus_patterns, words.indices
+        else:
+            words = list(words)
+            patterns = self.corpus_patterns
+            if not all(w in patterns for w in words):
+                # pool set from outside the corpus, score it against itself
+                patterns = get_pattern_matrix(words)
+            pool_indices = patterns.answer_indices(words)
+        if patterns is not self.patterns:
+            self._constraints = None
+        self.patterns = patterns
+        self.pool_indices = pool_indices
+        self.state = self.new_state(self.pool_indices)
+
+    @property
+    def constraints(self):
+        # only get_possibilities needs it, games never build it
+        if self._constraints is None:
+            self._constraints = get_constraint_index(self.patterns.answers)
+        return self._constraints
+
+    def restrict_pool(self, pool_indices):
+        self.pool_indices = pool_indices
+        self.state = self.new_state(pool_indices)
+
     def update_pool(self, guess, outcome):
-        self.pool = self.get_possibilities(guess, outcome)
+        # narrows the state's block instead of rescoring the candidates against the full matrix next turn
+        self.state.narrow(guess, outcome)
+        self.pool_indices = self.state.pool_indices
 
     def reset(self):
-        self.pool = self.corpus
+        self.pool = WordPool(self.corpus_patterns.answers, word_ids=self.corpus_patterns.answer_index)
 
     def get_entropy(self, word):
-        outcome_probabilities = []
-        init_pool_len = len(self.pool)
-        restricted_pool = set(self.pool)
-        for outcome in self.outcomes:
-            possibilities = self.get_possibilities(word, outcome, restricted_pool)
-            if possibilities:
-                outcome_probability = len(possibilities) / init_pool_len
-                outcome_probabilities += [outcome_probability]
-                restricted_pool.difference_update(possibilities)
+        weights = self.pool_weights(self.pool_indices)
+        counts = np.bincount(self.patterns.row(word, self.pool_indices), weights=weights)
+        total = len(self.pool_indices) if weights is None else weights.sum()
+        outcome_probabilities = list(counts[counts > 0] / total)
         entropy = EntropySolver.calc_entropy(outcome_probabilities)
         return entropy, outcome_probabilities  # todo outcome_probabilities is for unit tests
 
     def get_possibilities(self, guess, outcome, restricted_pool=None):
+        constraints = self.constraints
         if restricted_pool is None:
-            restricted_pool = self.pool
-        self.correct, self.present, self.present_positions, self.not_present = \
-            GreedyEntropySolver.parse_outcome(guess, outcome)
-        possibilities = self.get_init_possibilities(restricted_pool)
-        for word in list(possibilities.keys()):
-            remaining_letters = possibilities[word]
-            if not self.word_matches_present(remaining_letters) or \
-                    not self.word_matches_not_present(remaining_letters):
-                del possibilities[word]
-                continue
-        return list(possibilities.keys())
+            pool_indices = self.pool_indices
+        elif isinstance(restricted_pool, WordPool) and restricted_pool.words is self.patterns.answers:
+            pool_indices = restricted_pool.indices
+        else:
+            restricted_pool = list(restricted_pool)
+            if all(w in self.patterns for w in restricted_pool):
+                pool_indices = self.patterns.answer_indices(restricted_pool)
+            else:
+                constraints = get_constraint_index(restricted_pool)
+                pool_indices = np.arange(len(restricted_pool))
+        matches = constraints.matches(*GreedyEntropySolver.parse_outcome(guess, outcome))
+        return [constraints.words[i] for i in pool_indices[matches[pool_indices]]]
 
     @staticmethod
     def parse_outcome(guess, outcome):
@@ -128,38 +301,178 @@ class GreedyEntropySolver(EntropySolver):
                 present_positions += [None]
         return correct, present, present_positions, not_present
 
-    def get_init_possibilities(self, restricted_pool):
-        possibilities = {}
-        for word in restricted_pool:
-            matches, remaining_letters = self.word_matches_correct_and_present_positions(word)
-            if matches:
-                possibilities[word] = remaining_letters
-        return possibilities
-
-    def word_matches_correct_and_present_positions(self, word):
-        remaining_letters = Counter(word)
-        for idx, (to_match, to_avoid) in enumerate(zip(self.correct, self.present_positions)):
-            if to_match and to_match.isalpha():
-                if word[idx] != to_match:
-                    return False, None
+
+class LookaheadSolver(GreedyEntropySolver):
+    # picks the guess with the fewest expected guesses, looking depth turns ahead over the top_k
+    # entropy candidates of every node, leaves past the depth limit get an estimate
+    def __init__(self, corpus=None, outcomes=None, debug_log=False, guesses=None, depth=2, top_k=10,
+                 bits_per_guess=4.):
+        super().__init__(corpus, outcomes, debug_log, guesses)
+        self.depth = depth
+        self.top_k = top_k
+        self.bits_per_guess = bits_per_guess
+        self.memo = {}  # (pool signature, depth) -> (expected guesses, best guess)
+        self.memo_patterns = self.patterns  # the matrix the memo's pool ids index
+
+    @property
+    def config(self):
+        return f'{super().config}-d{self.depth}-k{self.top_k}-b{self.bits_per_guess}'
+
+    def get_best_guess(self):
+        if self.debug_log:
+            print(f'looking ahead over {len(self.pool)} words')
+        with metrics.timer('best_guess_seconds', solver=type(self).__name__):
+            candidates, candidate_entropies = self.score_state()
+            entropies = self.top_entropies(candidates, candidate_entropies)
+            _, best_guess = self.expected_guesses(self.pool_indices, self.depth, candidates, candidate_entropies)
+            if best_guess not in entropies:
+                entropies[best_guess] = float(self.get_entropy(best_guess)[0])
+        if self.debug_log:
+            print('best guess', best_guess, entropies[best_guess])
+        return best_guess, entropies
+
+    @staticmethod
+    def lower_bound(pool_len):
+        # at best a pool word is right or splits the rest into singletons, a word outside the pool can't do better
+        return (2 * pool_len - 1) / pool_len
+
+    def estimate(self, pool_len):
+        if pool_len <= 2:
+            return LookaheadSolver.lower_bound(pool_len)
+        return max(LookaheadSolver.lower_bound(pool_len), 1 + math.log(pool_len, 2) / self.bits_per_guess)
+
+    def partitions(self, guess_index, pool_indices):
+        row = self.patterns.matrix[guess_index, pool_indices]
+        order = np.argsort(row, kind='stable')
+        codes, starts, counts = np.unique(row[order], return_index=True, return_counts=True)
+        sorted_pool = pool_indices[order]
+        all_correct = self.patterns.num_patterns - 1
+        return [sorted_pool[start:start + count] for code, start, count in zip(codes, starts, counts)
+                if code != all_correct]
+
+    def expected_guesses(self, pool_indices, depth, candidates=None, candidate_entropies=None):
+        pool_len = len(pool_indices)
+        if pool_len <= 2:
+            return LookaheadSolver.lower_bound(pool_len), self.patterns.answers[pool_indices[0]]
+        if self.memo_patterns is not self.patterns:
+            # a pool set from outside the corpus (or back) renumbers the answers, old entries mean other pools
+            self.memo, self.memo_patterns = {}, self.patterns
+        key = (pool_indices.tobytes(), depth)
+        if key in self.memo:
+            return self.memo[key]
+        if candidates is None:
+            candidates = self.candidate_indices(pool_indices)
+            candidate_entropies = None
+        if candidate_entropies is None:
+            metrics.inc('entropies_computed', len(candidates))
+            candidate_entropies = self.patterns.entropies(candidates, pool_indices)
+        # words that could still be the answer first among equal entropies, a guess vocabulary lists its own
+        # words before the corpus and the top_k cut would otherwise drop the pool words
+        in_pool = np.isin(self.patterns.answer_of_guess[candidates], pool_indices)
+        candidates = candidates[np.lexsort((~in_pool, -candidate_entropies))[:self.top_k]]
+        best, best_guess = math.inf, self.patterns.guesses[candidates[0]]
+        for guess_index in candidates:
+            partitions = sorted(self.partitions(guess_index, pool_indices), key=len, reverse=True)
+            # remaining lower bound of the partitions not expanded yet, used to cut the candidate early
+            remaining = sum(len(p) * LookaheadSolver.lower_bound(len(p)) for p in partitions) / pool_len
+            expected = 1.
+            if expected + remaining >= best:
+                continue
+            for partition in partitions:
+                remaining -= len(partition) * LookaheadSolver.lower_bound(len(partition)) / pool_len
+                if depth > 1:
+                    value, _ = self.expected_guesses(partition, depth - 1)
                 else:
-                    remaining_letters[word[idx]] -= 1
-            if to_avoid and to_avoid.isalpha() and word[idx] == to_avoid:
-                return False, None
-        return True, remaining_letters
-
-    def word_matches_present(self, remaining_letters):
-        for present_letter, present_count in self.present.items():
-            count_after_present = remaining_letters[present_letter] - present_count
-            # need exact count in letter in not_present as well, else need positive count (0 incl)
-            if (present_letter in self.not_present and count_after_present != 0) or count_after_present < 0:
-                return False
-            # attention update remaining letters, not returning it
-            remaining_letters[present_letter] = count_after_present
-        return True
-
-    def word_matches_not_present(self, remaining_letters):
-        for letter, count in remaining_letters.items():
-            if letter in self.not_present and count > 0:
-                return False
-        return True
+                    value = self.estimate(len(partition))
+                expected += len(partition) * value / pool_len
+                if expected + remaining >= best:
+                    break
+            else:
+                best, best_guess = expected, self.patterns.guesses[guess_index]
+        self.memo[key] = best, best_guess
+        return best, best_guess
+
+
+class MultiBoardSolver(GreedyEntropySolver):
+    # quordle/octordle: every guess is scored against num_boards independent pools at once, the boards
+    # are independent so a guess' information is the sum of its entropies over the unsolved ones
+    def __init__(self, corpus=None, outcomes=None, debug_log=False, guesses=None, num_boards=4):
+        self.num_boards = num_boards
+        super().__init__(corpus, outcomes, debug_log, guesses)
+        # guess id of every answer, a pool-only matrix is square so they're the same ids
+        self.guess_of_answer = self.corpus_patterns.guess_indices(self.corpus_patterns.answers)
+        self.reset()
+
+    @property
+    def config(self):
+        return f'{super().config}-boards{self.num_boards}'
+
+    def reset(self):
+        super().reset()
+        self.pools = [self.pool_indices] * self.num_boards
+        self.solved = [False] * self.num_boards
+
+    def active_pools(self):
+        return [pool for pool, solved in zip(self.pools, self.solved) if not solved]
+
+    def get_best_guess(self):
+        pools = self.active_pools()
+        if self.debug_log:
+            print(f'getting entropies for {len(pools)} boards of {[len(p) for p in pools]} words')
+        with metrics.timer('best_guess_seconds', solver=type(self).__name__):
+            in_pools = np.unique(np.concatenate(pools))
+            singles = [pool[0] for pool in pools if len(pool) == 1]
+            if singles:
+                # a board down to one word needs that guess anyway, playing it now still informs the others
+                candidates = np.unique(self.guess_of_answer[singles])
+            elif self.guesses:
+                candidates = np.arange(len(self.patterns.guesses))
+            else:
+                candidates = self.guess_of_answer[in_pools]
+            metrics.inc('entropies_computed', len(candidates))
+            candidate_entropies = self.patterns.joint_entropies(candidates, pools)
+            best_index = self.pick(candidates, candidate_entropies, in_pools)
+            best_guess = self.patterns.guesses[best_index]
+            entropies = self.top_entropies(candidates, candidate_entropies)
+            entropies.setdefault(best_guess, float(candidate_entropies[np.argmax(candidates == best_index)]))
+        if self.debug_log:
+            print('best guess', best_guess, entropies[best_guess])
+        return best_guess, entropies
+
+    def update_pool(self, guess, outcomes):
+        # outcomes has one outcome per board, None for boards solved before this guess
+        all_correct = self.patterns.num_patterns - 1
+        for board, outcome in enumerate(outcomes):
+            if self.solved[board]:
+                continue
+            code = PatternMatrix.pattern_code(outcome)
+            if code == all_correct:
+                self.solved[board] = True
+                continue
+            pool = self.pools[board]
+            self.pools[board] = pool[self.patterns.row(guess, pool) == code]
+
+
+class BookSolver(Solver):
+    # plays a prebuilt OpeningBook, every turn is a dict lookup, no scoring at request time
+    def __init__(self, book, debug_log=False):
+        super().__init__(book.answers, None, debug_log)
+        self.book = book
+        self.node = 0
+
+    @property
+    def config(self):
+        return f'{super().config}-{self.book.solver_config}-book-{self.book.hash}'
+
+    def get_best_guess(self):
+        best_guess, entropy = self.book.guess(self.node)
+        return best_guess, {best_guess: entropy}
+
+    def update_pool(self, guess, outcome):
+        node = self.book.child(self.node, outcome)
+        if node is None or self.book.guess(self.node)[0] != guess:
+            raise ValueError(f'{guess} {outcome} leaves the opening book')
+        self.node = node
+
+    def reset(self):
+        self.node = 0
@@ -0,0 +1,55 @@
+import numpy as np
+from .patterns import PatternMatrix
+
+
+class PoolState:
+    # one game's candidates x pool block of the pattern matrix, narrowed in place after every feedback so
+    # later turns only touch the surviving pool and the candidates that can still tell it apart
+    def __init__(self, patterns, pool_indices, candidate_indices=None, chunk_size=512, weights=None):
+        self.patterns = patterns
+        self.weights = weights  # prior of every answer of patterns, None for equally likely
+        self.pool_indices = pool_indices
+        # None: guess from the pool, the (square) matrix uses the same ids for guesses and answers
+        self.from_pool = candidate_indices is None
+        self.candidates = pool_indices if self.from_pool else candidate_indices
+        self.chunk_size = chunk_size
+        self.block = None  # rows of the full matrix until the first narrow, copying that would be wasted
+
+    def rows(self):
+        if self.block is None:
+            return self.patterns.matrix[np.ix_(self.candidates, self.pool_indices)]
+        return self.block
+
+    def entropies(self):
+        weights = None if self.weights is None else self.weights[self.pool_indices]
+        if self.block is None:
+            return self.patterns.entropies(self.candidates, self.pool_indices, self.chunk_size, weights)
+        entropies = np.zeros(len(self.candidates))
+        for start in range(0, len(self.candidates), self.chunk_size):
+            rows = self.block[start:start + self.chunk_size]
+            entropies[start:start + rows.shape[0]] = PatternMatrix.rows_entropies(
+                rows, self.patterns.num_patterns, weights)
+        return entropies
+
+    def narrow(self, guess, outcome):
+        keep = self.patterns.row(guess, self.pool_indices) == PatternMatrix.pattern_code(outcome)
+        pool_indices = self.pool_indices[keep]
+        if self.block is None:
+            rows = self.candidates[keep] if self.from_pool else self.candidates
+            block = self.patterns.matrix[np.ix_(rows, pool_indices)]
+        else:
+            block = self.block[keep][:, keep] if self.from_pool else self.block[:, keep]
+        candidates = pool_indices if self.from_pool else self.candidates
+        if not self.from_pool and len(pool_indices):
+            # guesses that split the pool the same way split every later subset of it the same way too,
+            # keep the first of them (pick's tie break) and drop the ones that can't split it at all,
+            # guesses that could still be the answer always stay
+            block = np.ascontiguousarray(block)
+            _, first = np.unique(block.view(np.dtype((np.void, block.shape[1]))).ravel(), return_index=True)
+            informative = np.zeros(len(candidates), dtype=bool)
+            informative[first] = True
+            informative &= (block != block[:, :1]).any(axis=1)
+            informative |= np.isin(self.patterns.answer_of_guess[candidates], pool_indices)
+            candidates, block = candidates[informative], block[informative]
+        self.pool_indices, self.candidates, self.block = pool_indices, candidates, np.ascontiguousarray(block)
+        return keep
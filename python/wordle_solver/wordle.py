@@ -1,11 +1,13 @@
 from collections import Counter
 import random
+from .pool import WordPool
 from .solvers import Solver
 
 
 class Wordle:
     def __init__(self, corpus=None, seed=None, debug_log=False):
-        self.corpus = corpus.copy() if corpus else Solver.default_corpus()
+        # new_game removes targets from a pool of word ids, the word list stays shared with the solvers
+        self.corpus = WordPool(corpus if corpus else Solver.default_corpus())
         self.curr_word = None
         self.num_guesses = 0
         self.seed = seed
@@ -33,11 +35,20 @@ class Wordle:
     def guess(self, guess):
         if not self.curr_word:
             raise ValueError('new game needs to be started before guessing')
-        counter = Counter(self.curr_word)
+        outcome = Wordle.score(guess, self.curr_word)
+        self.num_guesses += 1
+        guess_is_successful = outcome == [2] * len(self.curr_word)
+        if guess_is_successful:
+            self.curr_word = None
+        return guess_is_successful, outcome
+
+    @staticmethod
+    def score(guess, target):
+        counter = Counter(target)
         outcome = []
         to_fill = []
         for location, guess_letter in enumerate(guess):
-            if guess_letter == self.curr_word[location]:
+            if guess_letter == target[location]:
                 outcome += [2]
                 counter[guess_letter] -= 1
             elif guess_letter not in counter:
@@ -52,8 +63,38 @@ class Wordle:
                 counter[guess_letter] -= 1
             else:
                 outcome[location] = 0
+        return outcome
+
+
+class MultiWordle:
+    # quordle/octordle: num_boards hidden words share every guess, a solved board gets no more feedback
+    def __init__(self, num_boards=4, corpus=None, seed=None):
+        self.num_boards = num_boards
+        self.corpus = WordPool(corpus if corpus else Solver.default_corpus())
+        self.random = random.Random(seed)
+        self.targets = None
+        self.solved = None
+        self.num_guesses = 0
+
+    def new_game(self, targets=None):
+        targets = list(targets) if targets else self.random.sample(self.corpus, self.num_boards)
+        if len(targets) != self.num_boards:
+            raise ValueError(f'{self.num_boards} targets needed, got {len(targets)}')
+        self.targets = targets
+        self.solved = [False] * self.num_boards
+        self.num_guesses = 0
+        return self.targets
+
+    def guess(self, guess):
+        if self.targets is None:
+            raise ValueError('new game needs to be started before guessing')
+        outcomes = []
+        for board, target in enumerate(self.targets):
+            if self.solved[board]:
+                outcomes += [None]
+                continue
+            outcome = Wordle.score(guess, target)
+            self.solved[board] = outcome == [2] * len(target)
+            outcomes += [outcome]
         self.num_guesses += 1
-        guess_is_successful = outcome == [2] * 5
-        if guess_is_successful:
-            self.curr_word = None
-        return guess_is_successful, outcome
+        return all(self.solved), outcomes